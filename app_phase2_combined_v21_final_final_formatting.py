@@ -7,26 +7,39 @@ from datetime import datetime
 import base64
 from io import BytesIO
 import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from fpdf import FPDF
-import re
-import fitz  # PyMuPDF
-from PyPDF2 import PdfMerger, PdfReader
+from PyPDF2 import PdfReader
 from reportlab.lib.pagesizes import landscape, letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer
-from reportlab.lib import colors
+from reportlab.platypus import BaseDocTemplate, Frame, NextPageTemplate, PageBreak, PageTemplate, Spacer
+from table_styles import WIDE_TITLE, styled_table, title_table
+from artifact_store import ArtifactStore
+from extraction_cache import ExtractionCache, PersistentExtractionCache, digest_key
+from helioscope_extractor import (
+    EXTRACTOR_VERSION,
+    HelioscopeExtraction,
+    UnsupportedReportError,
+    diff_extractions,
+    project_key,
+)
+from portfolio import filter_portfolio, latest_revisions, portfolio_frame, portfolio_totals
+from production_import import import_hourly_production
+from render_cache import render_key
+from report_parsers import PARSERS, identify_source
+from stage_timing import NULL_TIMER, StageTimer
+from upload_spool import read_upload, remove_spooled, sweep_spooled
 
-def save_to_pdf_page1(data):
-    """Generate System Summary PDF"""
-    # Create PDF in landscape mode
-    doc = SimpleDocTemplate(
-        "System_Summary.pdf",
-        pagesize=landscape(letter),  # Original size
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=20,
-        bottomMargin=20
-    )
+# Page layouts of the schedule sections: page size, left/right margin and top/bottom margin
+PAGE_LAYOUTS = {
+    "letter": (landscape(letter), 30, 20),
+    "wide": ((landscape(letter)[0] * 2, landscape(letter)[1]), 10, 10),  # Double width
+}
+
+def system_summary_elements(data):
+    """System Summary title and table, as flowables"""
     elements = []
     
     # Calculate column widths for more compact layout
@@ -38,75 +51,20 @@ def save_to_pdf_page1(data):
     for key, value in data.items():
         table_data.append([str(key), str(value)])
     
-    # Create table
-    table = Table(table_data, colWidths=col_widths)
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),  # Center align all content
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(table_data), 2)]
-    ])
-    table.setStyle(style)
+    # Create table, styled with the section's shared style
+    table = styled_table("System Summary", table_data, col_widths)
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["System Summary"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("System Summary", sum(col_widths))
     
     # Add elements to the document
     elements.append(title)
     elements.append(table)
     
-    # Build the document
-    doc.build(elements)
-    return "System_Summary.pdf"
+    return elements
 
-def save_to_pdf_page2(dataframe):
-    """Generate Feed Schedule PDF"""
-    # Create PDF in landscape mode
-    doc = SimpleDocTemplate(
-        "Feed_Schedule.pdf",
-        pagesize=landscape(letter),  # Original size
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=20,
-        bottomMargin=20
-    )
+def feed_schedule_elements(dataframe):
+    """Feed Schedule title and table, as flowables"""
     elements = []
     
     # Calculate column widths for more compact layout
@@ -118,155 +76,20 @@ def save_to_pdf_page2(dataframe):
     for _, row in dataframe.iterrows():
         table_data.append([str(row['TAG']), str(row['DESCRIPTION'])])
     
-    # Create table
-    table = Table(table_data, colWidths=col_widths)
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),  # Center align all content
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(table_data), 2)]
-    ])
-    table.setStyle(style)
+    # Create table, styled with the section's shared style
+    table = styled_table("Feed Schedule", table_data, col_widths)
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["Feed Schedule"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("Feed Schedule", sum(col_widths))
     
     # Add elements to the document
     elements.append(title)
     elements.append(table)
     
-    # Build the document
-    doc.build(elements)
-    return "Feed_Schedule.pdf"
+    return elements
 
-def save_to_pdf_page3(data):
-    """Generate Metco Equipment PDF"""
-    # Create PDF in landscape mode with double width
-    doc = SimpleDocTemplate(
-        "Metco_Equipment.pdf",
-        pagesize=(landscape(letter)[0] * 2, landscape(letter)[1]),  # Double width
-        rightMargin=10,
-        leftMargin=10,
-        topMargin=10,
-        bottomMargin=10
-    )
-    elements = []
-    
-    # Calculate column widths
-    page_width = (landscape(letter)[0] * 2) - 20  # Account for margins
-    col_widths = [page_width * 0.3, page_width * 0.7]  # 30% for field, 70% for value
-    
-    # Create table data
-    table_data = [["Field", "Value"]]  # Header row
-    for field, value in data.items():
-        table_data.append([str(field), str(value)])
-    
-    # Create table
-    table = Table(table_data, colWidths=col_widths)
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(table_data), 2)]
-    ])
-    table.setStyle(style)
-    
-    # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 16),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["Metco Equipment"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
-    
-    # Add elements to the document
-    elements.append(title)
-    elements.append(table)
-    
-    # Build the document
-    doc.build(elements)
-    return "Metco_Equipment.pdf"
-
-def generate_equipment_pdf_page3(data):
-    """Generate Metco Equipment PDF with improved formatting"""
-    # Create PDF in landscape mode
-    doc = SimpleDocTemplate(
-        "Metco_Equipment.pdf",
-        pagesize=landscape(letter),  # Original size
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=20,
-        bottomMargin=20
-    )
+def equipment_elements(data):
+    """Metco Equipment title and table with improved formatting, as flowables"""
     elements = []
     
     # Calculate column widths for more compact layout
@@ -283,75 +106,20 @@ def generate_equipment_pdf_page3(data):
     table_data = [["Equipment", "Manufacturer", "Model Number", "Furnished By", "Installed By"]]
     table_data.extend(data)
     
-    # Create table with the specified column widths
-    table = Table(table_data, colWidths=col_widths)
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),  # Center align all content
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(table_data), 2)]
-    ])
-    table.setStyle(style)
+    # Create table with the specified column widths, styled with the section's shared style
+    table = styled_table("Metco Equipment", table_data, col_widths)
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["METCO Provided Equipment"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("METCO Provided Equipment", sum(col_widths))
     
     # Add elements to the document
     elements.append(title)
     elements.append(table)
     
-    # Build the document
-    doc.build(elements)
-    return "Metco_Equipment.pdf"
+    return elements
 
-def generate_pdf_page4(df):
-    """Generate Inverter Schedule PDF with improved formatting"""
-    # Create PDF in landscape mode with double width
-    doc = SimpleDocTemplate(
-        "inverter_schedule.pdf",
-        pagesize=(landscape(letter)[0] * 2, landscape(letter)[1]),  # Double width
-        rightMargin=10,
-        leftMargin=10,
-        topMargin=10,
-        bottomMargin=10
-    )
+def inverter_schedule_elements(df):
+    """Inverter Schedule title and table with improved formatting, as flowables"""
     elements = []
     
     # Calculate column widths based on content
@@ -406,77 +174,20 @@ def generate_pdf_page4(df):
     # Convert all values to strings to avoid type errors
     table_data = header_rows + [[str(val) if val is not None else '' for val in row] for row in df.values.tolist()]
     
-    # Create table
-    table = Table(table_data, colWidths=col_widths, repeatRows=len(header_rows))
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling for all header rows
-        ('BACKGROUND', (0, 0), (-1, len(header_rows)-1), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, len(header_rows)-1), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, len(header_rows)-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, len(header_rows)-1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, len(header_rows)-1), 8),
-        ('TOPPADDING', (0, 0), (-1, len(header_rows)-1), 8),
-        ('LEADING', (0, 0), (-1, len(header_rows)-1), 12),
-        
-        # Content styling
-        ('BACKGROUND', (0, len(header_rows)), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, len(header_rows)), (-1, -1), colors.black),
-        ('FONTNAME', (0, len(header_rows)), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, len(header_rows)), (-1, -1), 9),
-        ('TOPPADDING', (0, len(header_rows)), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, len(header_rows)), (-1, -1), 6),
-        ('LEADING', (0, len(header_rows)), (-1, -1), 10),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors for better readability
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(len(header_rows), len(table_data), 2)]
-    ])
-    table.setStyle(style)
+    # Create table, styled with the section's shared style
+    table = styled_table("Inverter Schedule", table_data, col_widths, repeatRows=len(header_rows))
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 16),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["INVERTER SCHEDULE"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("INVERTER SCHEDULE", sum(col_widths), WIDE_TITLE)
     
     # Add elements to the document
     elements.append(title)
     elements.append(table)
     
-    # Build the document
-    doc.build(elements)
-    return "inverter_schedule.pdf"
+    return elements
 
-def create_pdf_page5(df):
-    """Generate String Table PDF"""
-    # Create PDF in landscape mode with double width
-    doc = SimpleDocTemplate(
-        "stringing_table.pdf",
-        pagesize=(landscape(letter)[0] * 2, landscape(letter)[1]),  # Double width
-        rightMargin=10,
-        leftMargin=10,
-        topMargin=10,
-        bottomMargin=10
-    )
+def string_table_elements(df):
+    """String Table title and table, as flowables"""
     elements = []
     
     # Calculate column widths
@@ -514,81 +225,20 @@ def create_pdf_page5(df):
     # Convert all values to strings to avoid type errors
     table_data = header_rows + [[str(val) if val is not None else '' for val in row] for row in df.values.tolist()]
     
-    # Create table
-    table = Table(table_data, colWidths=col_widths, repeatRows=len(header_rows))
-    
-    # Add style to the table
-    style = TableStyle([
-        # Header styling for all header rows
-        ('BACKGROUND', (0, 0), (-1, len(header_rows)-1), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, len(header_rows)-1), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, len(header_rows)-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, len(header_rows)-1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, len(header_rows)-1), 8),
-        ('TOPPADDING', (0, 0), (-1, len(header_rows)-1), 8),
-        ('LEADING', (0, 0), (-1, len(header_rows)-1), 12),
-        
-        # Content styling
-        ('BACKGROUND', (0, len(header_rows)), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, len(header_rows)), (-1, -1), colors.black),
-        ('FONTNAME', (0, len(header_rows)), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, len(header_rows)), (-1, -1), 9),
-        ('TOPPADDING', (0, len(header_rows)), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, len(header_rows)), (-1, -1), 6),
-        ('LEADING', (0, len(header_rows)), (-1, -1), 10),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Span cells for TAG and # columns
-        ('SPAN', (0, 0), (0, 1)),  # TAG
-        ('SPAN', (1, 0), (1, 1)),  # #
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors for better readability
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(len(header_rows), len(table_data), 2)]
-    ])
-    table.setStyle(style)
+    # Create table, styled with the section's shared style
+    table = styled_table("String Table", table_data, col_widths, repeatRows=len(header_rows))
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 16),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-        ('TOPPADDING', (0, 0), (-1, -1), 20),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["STRING TABLE"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("STRING TABLE", sum(col_widths), WIDE_TITLE)
     
     # Add elements to the document
     elements.append(title)
     elements.append(table)
     
-    # Build the document
-    doc.build(elements)
-    return "stringing_table.pdf"
+    return elements
 
-def generate_pdf_page6(panel_details, df):
-    """Generate Panel Schedule PDF"""
-    # Create PDF in landscape mode
-    doc = SimpleDocTemplate(
-        "panel_schedule.pdf",
-        pagesize=landscape(letter),  # Original size
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=20,
-        bottomMargin=20
-    )
+def panel_schedule_elements(panel_details, df):
+    """Panel Schedule title and tables, as flowables"""
     elements = []
     
     # Calculate column widths for more compact layout
@@ -600,43 +250,8 @@ def generate_pdf_page6(panel_details, df):
     for key, value in panel_details.items():
         panel_data.append([str(key), str(value)])
     
-    # Create panel details table
-    panel_table = Table(panel_data, colWidths=col_widths)
-    
-    # Add style to the panel details table
-    panel_style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),  # Center align all content
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(panel_data), 2)]
-    ])
-    panel_table.setStyle(panel_style)
+    # Create panel details table, styled with the section's shared style
+    panel_table = styled_table("Panel Schedule", panel_data, col_widths)
     
     # Calculate column widths for the schedule table
     schedule_col_widths = [
@@ -658,55 +273,11 @@ def generate_pdf_page6(panel_details, df):
             str(row["Circuit #"])
         ])
     
-    # Create schedule table
-    schedule_table = Table(schedule_data, colWidths=schedule_col_widths)
-    
-    # Add style to the schedule table
-    schedule_style = TableStyle([
-        # Header styling
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),  # Dark green
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        
-        # Content styling
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),  # Center align all content
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        
-        # Grid styling
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEAFTER', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.black),
-        ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
-        
-        # Word wrapping
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        
-        # Alternate row colors
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor('#E8F5E9'))  # Light green
-          for i in range(1, len(schedule_data), 2)]
-    ])
-    schedule_table.setStyle(schedule_style)
+    # Create schedule table, styled with the section's shared style
+    schedule_table = styled_table("Panel Schedule", schedule_data, schedule_col_widths)
     
     # Add title
-    title_style = TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2E7D32')),  # Dark green
-    ])
-    title = Table([["Panel Schedule"]], colWidths=[sum(col_widths)])
-    title.setStyle(title_style)
+    title = title_table("Panel Schedule", sum(col_widths))
     
     # Add elements to the document
     elements.append(title)
@@ -714,24 +285,68 @@ def generate_pdf_page6(panel_details, df):
     elements.append(Spacer(1, 15))  # Reduced space between tables
     elements.append(schedule_table)
     
-    # Build the document
-    doc.build(elements)
-    return "panel_schedule.pdf"
+    return elements
 
-def merge_pdfs(pdf_files):
-    """Merge multiple PDFs into a single report with consistent formatting"""
-    merger = PdfMerger()
-    
-    # Add each PDF with proper page breaks
-    for pdf in pdf_files:
-        merger.append(pdf)
-    
-    # Create the final merged PDF
-    output_path = "Solar_System_Report.pdf"
-    merger.write(output_path)
-    merger.close()
-    
-    return output_path
+# Section: page layout and the function building its flowables from the section's inputs
+SECTION_RENDERERS = {
+    "System Summary": ("letter", system_summary_elements),
+    "Feed Schedule": ("letter", feed_schedule_elements),
+    "Metco Equipment": ("letter", equipment_elements),
+    "Inverter Schedule": ("wide", inverter_schedule_elements),
+    "String Table": ("wide", string_table_elements),
+    "Panel Schedule": ("letter", panel_schedule_elements),
+}
+
+def page_frame(layout):
+    """Page size of a layout and the frame its flowables are laid out in"""
+    pagesize, side_margin, end_margin = PAGE_LAYOUTS[layout]
+    frame = Frame(
+        side_margin,
+        end_margin,
+        pagesize[0] - 2 * side_margin,
+        pagesize[1] - 2 * end_margin,
+        id=layout
+    )
+    return pagesize, frame
+
+def render_section(section, *inputs):
+    """Render one section as a PDF of its own, returned as bytes"""
+    layout, build_elements = SECTION_RENDERERS[section]
+    pagesize, frame = page_frame(layout)
+    buffer = BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=pagesize)
+    doc.addPageTemplates([PageTemplate(id=layout, frames=[frame], pagesize=pagesize)])
+    doc.build(build_elements(*inputs))
+    return buffer.getvalue()
+
+def render_report(sections):
+    """Render sections, (section, inputs) pairs in order, as one PDF in a single build, returned as bytes.
+    
+    Each section starts a new page on its layout's page template, so the
+    letter and double-width sections share one document (fonts and all)
+    instead of being rendered separately and merged.
+    """
+    sections = list(sections)
+    layouts = [SECTION_RENDERERS[section][0] for section, _ in sections]
+    
+    # The document starts on the first section's page template
+    templates = []
+    for layout in sorted(PAGE_LAYOUTS, key=lambda layout: layout != layouts[0]):
+        pagesize, frame = page_frame(layout)
+        templates.append(PageTemplate(id=layout, frames=[frame], pagesize=pagesize))
+    
+    story = []
+    for index, ((section, inputs), layout) in enumerate(zip(sections, layouts)):
+        if index:
+            story.append(NextPageTemplate(layout))
+            story.append(PageBreak())
+        story.extend(SECTION_RENDERERS[section][1](*inputs))
+    
+    buffer = BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=PAGE_LAYOUTS[layouts[0]][0])
+    doc.addPageTemplates(templates)
+    doc.build(story)
+    return buffer.getvalue()
 
 def create_default_values_page4(num_rows, manufacturer_model, phase, volts, fla, kw, mocp, mocs, dcda, dcdnr, acda, acdnr, remarks):
     """Create default values for inverter schedule"""
@@ -793,6 +408,16 @@ def fill_table_page5(data, num_inverters, best_panels_per_string, remainder, no_
                         return data
     return data
 
+# On-disk extraction cache that lets a restarted app answer repeat uploads instantly; the
+# entry and byte limits of the caches are the defaults in extraction_cache
+EXTRACTION_CACHE_DB = os.environ.get("EXTRACTION_CACHE_DB", os.path.join(".cache", "extractions.sqlite3"))
+# Most recently used on-disk entries loaded into memory when the app starts
+EXTRACTION_CACHE_WARM_ENTRIES = 32
+# Threads extracting uploaded reports in the background, shared by every session
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", 2))
+# Seconds between reruns of the Design Report while its extraction runs
+EXTRACTION_POLL_SECONDS = 0.3
+
 # Set page config
 st.set_page_config(
     page_title="Solar System Design & Schedule",
@@ -879,6 +504,24 @@ if 'auto_populated' not in st.session_state:
     st.session_state.auto_populated = False
 if 'pdf_cache' not in st.session_state:
     st.session_state.pdf_cache = {}
+if 'spooled_upload' not in st.session_state:
+    st.session_state.spooled_upload = None
+if 'helioscope_extraction' not in st.session_state:
+    st.session_state.helioscope_extraction = None
+if 'extraction_timings' not in st.session_state:
+    st.session_state.extraction_timings = None
+if 'applied_extraction_key' not in st.session_state:
+    st.session_state.applied_extraction_key = None
+if 'revision_changes' not in st.session_state:
+    st.session_state.revision_changes = None
+if 'extraction_job' not in st.session_state:
+    st.session_state.extraction_job = None
+if 'report_inputs' not in st.session_state:
+    # (project, section) -> inputs of the section's last generated PDF, for the combined report
+    st.session_state.report_inputs = {}
+if 'session_id' not in st.session_state:
+    # Names this session's generated PDFs in the shared artifact store
+    st.session_state.session_id = uuid.uuid4().hex
 if 'system_summary_data' not in st.session_state:
     st.session_state.system_summary_data = {
         "DC SYSTEM SIZE": "",
@@ -904,141 +547,291 @@ if 'string_table_data' not in st.session_state:
         "no_of_mppt": 1
     }
 
-def extract_helioscope_data(pdf_content):
-    """Extract data from Helioscope report using the extraction logic from app_3_report_extractor.py"""
+@st.cache_resource
+def get_extraction_cache():
+    """Process-wide extraction cache shared by every session, backed by SQLite"""
+    store = PersistentExtractionCache(
+        EXTRACTION_CACHE_DB,
+        EXTRACTOR_VERSION,
+        serialize=HelioscopeExtraction.to_json,
+        deserialize=HelioscopeExtraction.from_json
+    )
+    cache = ExtractionCache(store=store)
+    cache.warm(EXTRACTION_CACHE_WARM_ENTRIES)
+    return cache
+
+@st.cache_resource
+def get_artifact_store():
+    """Process-wide store of generated PDFs, keyed by session and project"""
+    return ArtifactStore()
+
+@st.cache_resource
+def get_extraction_executor():
+    """Thread pool running report extractions off the script thread, shared by every session"""
+    return ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS, thread_name_prefix="extraction")
+
+def system_summary_from_components(component_details):
+    """System Summary form values derived from the extracted components"""
+    return {
+        "DC SYSTEM SIZE": f"{component_details['module'].value:,} kW",
+        "AC SYSTEM SIZE": f"{component_details['inverter'].value:,} kW",
+        "INVERTER (PRODUCT NAME)": component_details['inverter'].description,
+        "NO OF INVERTERS": str(component_details['inverter'].count),
+        "SOLAR PV MODULE (PRODUCT NAME)": component_details['module'].description,
+        "NO OF SOLAR PV MODULES": str(component_details['module'].count),
+        "RACKING (PRODUCT NAME)": "",
+        "NO OF RACKINGS": ""
+    }
+
+def inverter_schedule_from_components(component_details):
+    """Inverter Schedule form values derived from the extracted components"""
+    return {
+        "num_rows": component_details['inverter'].count,
+        "manufacturer_model": component_details['inverter'].description,
+        "kw": component_details['inverter'].value
+    }
+
+def string_table_from_components(component_details):
+    """String Table form values derived from the extracted components"""
+    return {
+        "num_inverters": component_details['inverter'].count,
+        "num_panels": component_details['module'].count,
+        "no_of_string": component_details['strings'].count // component_details['inverter'].count
+    }
+
+# Schedule sections fed by the extracted components: the components each one depends on,
+# the session data rebuilt from them and the widgets seeded from them
+SCHEDULE_SECTIONS = {
+    "System Summary": {
+        "inputs": ("inverter", "module"),
+        "data": ("system_summary_data", system_summary_from_components)
+    },
+    "Metco Equipment": {
+        "inputs": ("inverter", "module"),
+        "widgets": ("manufacturer_PV MODULES", "model_PV MODULES", "manufacturer_INVERTERS", "model_INVERTERS")
+    },
+    "Inverter Schedule": {
+        "inputs": ("inverter",),
+        "data": ("inverter_schedule_data", inverter_schedule_from_components)
+    },
+    "String Table": {
+        "inputs": ("inverter", "strings", "module"),
+        "data": ("string_table_data", string_table_from_components)
+    },
+    "Panel Schedule": {
+        "inputs": ("inverter",)
+    },
+}
+
+# Sections of the combined report, in order: section name (of its renderer and stored PDF) and file name
+REPORT_SECTIONS = (
+    ("System Summary", "System_Summary.pdf"),
+    ("Feed Schedule", "Feed_Schedule.pdf"),
+    ("Metco Equipment", "Metco_Equipment.pdf"),
+    ("Inverter Schedule", "inverter_schedule.pdf"),
+    ("String Table", "stringing_table.pdf"),
+    ("Panel Schedule", "panel_schedule.pdf"),
+)
+
+def artifact_scope():
+    """(session id, project) under which this session's generated PDFs are stored"""
+    extraction = st.session_state.helioscope_extraction
+    key = project_key(extraction) if extraction is not None else None
+    project = " | ".join(key) if key is not None else ""
+    return st.session_state.session_id, project
+
+def save_artifact(section, content):
+    """Store a section's generated PDF for this session and project"""
+    get_artifact_store().put(*artifact_scope(), section, content)
+
+def cached_render(section, inputs, render):
+    """PDF of a section rendered from inputs, from the artifact store when any session rendered it before"""
+    # Stored under its render key as well as under each session's name for it, the PDF is
+    # kept once, within the store's byte budget
+    store = get_artifact_store()
+    key = render_key(section, inputs)
+    content = store.get_shared(key)
+    if content is None:
+        content = render()
+        store.put_shared(key, content)
+    return content
+
+def generate_section(section, *inputs):
+    """Render a section's PDF and keep it, and its inputs for the combined report, for this session and project"""
+    save_artifact(section, cached_render(section, inputs, lambda: render_section(section, *inputs)))
+    st.session_state.report_inputs[(artifact_scope()[1], section)] = inputs
+
+def load_artifact(section):
+    """This session's generated PDF of a section for the current project, or None"""
+    return get_artifact_store().get(*artifact_scope(), section)
+
+def refresh_schedule_section(section):
+    """Rebuild a schedule section from the extracted components and drop what was generated from the old ones"""
+    spec = SCHEDULE_SECTIONS[section]
+    component_details = st.session_state.component_details
+    
+    # Rebuild the form data when every component it needs was extracted
+    if "data" in spec and all(component_details[kind] for kind in spec["inputs"]):
+        data_key, build = spec["data"]
+        st.session_state[data_key] = build(component_details)
+    
+    # Widgets keep their own state, so clear them to have them seeded again
+    for widget_key in spec.get("widgets", ()):
+        st.session_state.pop(widget_key, None)
+    
+    # The generated PDF is stale until the section is generated again
+    get_artifact_store().discard(*artifact_scope(), section)
+    st.session_state.report_inputs.pop((artifact_scope()[1], section), None)
+
+def apply_extraction_to_session_state(extraction):
+    """Copy a HelioscopeExtraction into the session state used by the schedule pages.
+    
+    A revision of the project already loaded (same name and address) only
+    refreshes the schedule sections whose components changed, keeping the
+    edits made to the others; any other report refreshes every section.
+    """
+    previous = st.session_state.helioscope_extraction
+    key = project_key(extraction)
+    # A report naming no project is never taken for a revision of the one loaded
+    if previous is not None and key is not None and project_key(previous) == key:
+        changed = diff_extractions(previous, extraction)
+        sections = [name for name, spec in SCHEDULE_SECTIONS.items() if changed.intersection(spec["inputs"])]
+        st.session_state.revision_changes = {
+            "project": extraction.project_name,
+            "changed": sorted(changed),
+            "sections": sections
+        }
+    else:
+        sections = list(SCHEDULE_SECTIONS)
+        st.session_state.revision_changes = None
+    
+    st.session_state.helioscope_extraction = extraction
+    
+    # Store component details for auto-population
+    st.session_state.component_details = extraction.component_details()
+    
+    for section in sections:
+        refresh_schedule_section(section)
+
+def get_upload_source(uploaded_file, timer=NULL_TIMER):
+    """PDF source (bytes, or a spooled file path for large reports) and cache key of an upload"""
+    upload_id = getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+    spooled = st.session_state.spooled_upload
+    
+    # Reruns with the same upload reuse its spooled file and key instead of copying and hashing again
+    if spooled and spooled["upload_id"] == upload_id:
+        if spooled["path"] is None:
+            return uploaded_file.getvalue(), spooled["cache_key"]
+        if os.path.exists(spooled["path"]):
+            return spooled["path"], spooled["cache_key"]
+    
+    # A new upload replaces the previous one; also clear out files left by ended sessions
+    if spooled:
+        remove_spooled(spooled["path"])
+    sweep_spooled()
+    
+    with timer.stage("read_upload"):
+        source, digest = read_upload(uploaded_file)
+    cache_key = digest_key(digest, EXTRACTOR_VERSION)
+    st.session_state.spooled_upload = {
+        "upload_id": upload_id,
+        "path": None if isinstance(source, bytes) else source,
+        "cache_key": cache_key
+    }
+    return source, cache_key
+
+def run_extraction(cache, source, cache_key, timer, progress, parser):
+    """Extract a report and store it in the cache; runs on the executor, so no session state here"""
+    # The report was already identified on the script thread, so its tool's parser runs directly.
+    # Helioscope pages are read lazily and reading stops once every required field is found.
+    # Long reports are read across worker processes; short ones stay serial.
+    with timer.stage("extract"):
+        extraction = parser.extract(source, timer=timer, progress=progress, parallel=True)
+    with timer.stage("cache_store"):
+        cache.put(cache_key, extraction)
+    return extraction
+
+def start_background_extraction(cache, source, cache_key, timer, parser):
+    """Submit an extraction to the shared executor and track it in session state"""
+    # Updated from the worker thread page by page, read by the polling reruns
+    progress = {"pages_read": 0, "page_count": 0}
+    def on_page(pages_read, page_count):
+        progress["pages_read"] = pages_read
+        progress["page_count"] = page_count
+    
+    future = get_extraction_executor().submit(run_extraction, cache, source, cache_key, timer, on_page, parser)
+    st.session_state.extraction_job = {
+        "cache_key": cache_key,
+        "future": future,
+        "progress": progress,
+        "timer": timer
+    }
+    return st.session_state.extraction_job
+
+def extract_helioscope_data(source, cache_key, timer=None):
+    """Extract data from a design report (bytes or file path) and apply it to session state.
+    
+    Reports already in the cache are applied straight away. Others are
+    extracted on the shared background executor: this returns None while that
+    runs (st.session_state.extraction_job holds its progress) and the report
+    dict on the first rerun after it finishes.
+    """
+    timer = timer or StageTimer()
     try:
-        # Convert PDF content to text
-        doc = fitz.open(stream=pdf_content, filetype="pdf")
-        text = "\n".join([page.get_text() for page in doc])
-        
-        # Extract data using the enhanced extraction logic
-        data = {}
-        
-        # Project Info
-        project_name = re.search(r"Project Name\s+(.*)", text)
-        address = re.search(r"Project\s+Address\s+(.*?)\s+USA", text, re.DOTALL)
-        if project_name: data["PROJECT NAME"] = project_name.group(1).strip()
-        if address: data["PROJECT ADDRESS"] = address.group(1).replace('\n', ', ').strip()
-        
-        # Production Info
-        production = re.search(r"Annual\s+Production\s+([\d.]+)\s+MWh", text)
-        ratio = re.search(r"Performance\s+Ratio\s+([\d.]+)%", text)
-        if production: data["ANNUAL PRODUCTION"] = f"{production.group(1)} MWh"
-        if ratio: data["PERFORMANCE RATIO"] = f"{ratio.group(1)}%"
-        
-        # Weather Dataset
-        weather = re.search(r"Weather Dataset\s+(.+?)\s+Simulator Version", text, re.DOTALL)
-        if weather: data["WEATHER DATASET"] = weather.group(1).replace("\n", " ").strip()
-        
-        # Extract components information
-        components = []
-        component_block = re.findall(
-            r"(Inverters|Strings[^\n]*?|Module)\s+([A-Za-z0-9\-/,().\s]+?)\s+(\d+)\s+\(([\d.,]+)\s*(kW|ft)\)",
-            text
+        # Reruns and repeat uploads of the same report are served from the shared cache
+        cache = get_extraction_cache()
+        job = st.session_state.extraction_job
+        if job is not None and job["cache_key"] != cache_key:
+            # The report was replaced; one whose extraction has not started yet is never extracted
+            job["future"].cancel()
+            job = st.session_state.extraction_job = None
+        
+        if job is None:
+            with timer.stage("cache_lookup"):
+                extraction = cache.get(cache_key)
+            cache_hit = extraction is not None
+            if extraction is None:
+                # The report's tool is identified from its first page; scanned PDFs and
+                # reports of unsupported tools are turned away before anything is queued
+                with timer.stage("identify"):
+                    parser = identify_source(source)
+                job = start_background_extraction(cache, source, cache_key, timer, parser)
+        
+        if job is not None:
+            if not job["future"].done():
+                return None
+            # Finished: apply it with the timings collected while it ran
+            st.session_state.extraction_job = None
+            extraction = job["future"].result()
+            cache_hit = False
+            timer = job["timer"]
+        
+        with timer.stage("apply"):
+            # Reruns with the same report leave the schedule (and any edits to it) alone
+            if st.session_state.applied_extraction_key != cache_key:
+                apply_extraction_to_session_state(extraction)
+                st.session_state.applied_extraction_key = cache_key
+            report = extraction.to_report_dict()
+        
+        timings = timer.log(
+            "helioscope extraction",
+            cache_key=cache_key,
+            cache_hit=cache_hit,
+            pages_read=extraction.pages_read,
+            page_count=extraction.page_count
         )
-        
-        for comp in component_block:
-            components.append({
-                "Component": comp[0].strip(),
-                "Description": comp[1].strip(),
-                "Count": comp[2].strip(),
-                "Value": comp[3].strip(),
-                "Unit": comp[4].strip()
-            })
-        
-        # Extract system losses
-        system_losses = []
-        losses_pattern = r"([A-Za-z\s]+)\s+([\d.]+)%"
-        losses_matches = re.findall(losses_pattern, text)
-        for loss_type, loss_value in losses_matches:
-            if "loss" in loss_type.lower() or "degradation" in loss_type.lower():
-                system_losses.append({
-                    "Loss Type": loss_type.strip(),
-                    "Loss (%)": f"{loss_value}%"
-                })
-        data["SYSTEM LOSSES"] = system_losses
-        
-        # Store component details for auto-population
-        st.session_state.component_details = {
-            "inverter": next((c for c in components if "inverter" in c["Component"].lower()), None),
-            "strings": next((c for c in components if "string" in c["Component"].lower()), None),
-            "module": next((c for c in components if "module" in c["Component"].lower()), None)
-        }
-        
-        # Store system summary data
-        if st.session_state.component_details["module"]:
-            st.session_state.system_summary_data = {
-                "DC SYSTEM SIZE": f"{st.session_state.component_details['module']['Value']} kW",
-                "AC SYSTEM SIZE": f"{st.session_state.component_details['inverter']['Value']} kW",
-                "INVERTER (PRODUCT NAME)": st.session_state.component_details['inverter']['Description'],
-                "NO OF INVERTERS": st.session_state.component_details['inverter']['Count'],
-                "SOLAR PV MODULE (PRODUCT NAME)": st.session_state.component_details['module']['Description'],
-                "NO OF SOLAR PV MODULES": st.session_state.component_details['module']['Count'],
-                "RACKING (PRODUCT NAME)": "",
-                "NO OF RACKINGS": ""
-            }
-        
-        # Store inverter schedule data
-        if st.session_state.component_details["inverter"]:
-            st.session_state.inverter_schedule_data = {
-                "num_rows": int(st.session_state.component_details['inverter']['Count']),
-                "manufacturer_model": st.session_state.component_details['inverter']['Description'],
-                "kw": float(st.session_state.component_details['inverter']['Value'])
-            }
-        
-        # Store string table data
-        if st.session_state.component_details["strings"] and st.session_state.component_details["inverter"]:
-            st.session_state.string_table_data = {
-                "num_inverters": int(st.session_state.component_details['inverter']['Count']),
-                "num_panels": int(st.session_state.component_details['module']['Count']),
-                "no_of_string": int(st.session_state.component_details['strings']['Count']) // int(st.session_state.component_details['inverter']['Count'])
-            }
-        
-        return {
-            **data,
-            "COMPONENTS": components
-        }
+        # Keep the timings of the run that did the work, not of the cached reruns after it
+        previous = st.session_state.extraction_timings
+        if not (cache_hit and previous and previous["cache_key"] == cache_key):
+            st.session_state.extraction_timings = timings
+        return report
+    except UnsupportedReportError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"Error extracting data from PDF: {str(e)}")
         return None
 
-def auto_populate_system_schedule():
-    """Auto-populate system schedule with extracted data"""
-    if not st.session_state.get('component_details'):
-        return
-    
-    # Auto-populate System Summary
-    if st.session_state.current_page == "System Summary":
-        if st.session_state.component_details["module"]:
-            st.session_state.system_summary_data = {
-                "DC SYSTEM SIZE": f"{st.session_state.component_details['module']['Value']} kW",
-                "AC SYSTEM SIZE": f"{st.session_state.component_details['inverter']['Value']} kW",
-                "INVERTER (PRODUCT NAME)": st.session_state.component_details['inverter']['Description'],
-                "NO OF INVERTERS": st.session_state.component_details['inverter']['Count'],
-                "SOLAR PV MODULE (PRODUCT NAME)": st.session_state.component_details['module']['Description'],
-                "NO OF SOLAR PV MODULES": st.session_state.component_details['module']['Count'],
-                "RACKING (PRODUCT NAME)": "",
-                "NO OF RACKINGS": ""
-            }
-    
-    # Auto-populate Inverter Schedule
-    elif st.session_state.current_page == "Inverter Schedule":
-        if st.session_state.component_details["inverter"]:
-            st.session_state.inverter_schedule_data = {
-                "num_rows": int(st.session_state.component_details['inverter']['Count']),
-                "manufacturer_model": st.session_state.component_details['inverter']['Description'],
-                "kw": float(st.session_state.component_details['inverter']['Value'])
-            }
-    
-    # Auto-populate String Table
-    elif st.session_state.current_page == "String Table":
-        if st.session_state.component_details["strings"] and st.session_state.component_details["inverter"]:
-            st.session_state.string_table_data = {
-                "num_inverters": int(st.session_state.component_details['inverter']['Count']),
-                "num_panels": int(st.session_state.component_details['module']['Count']),
-                "no_of_string": int(st.session_state.component_details['strings']['Count']) // int(st.session_state.component_details['inverter']['Count'])
-            }
-
 def show_design_report():
     st.title("Design Report")
     
@@ -1053,20 +846,56 @@ def show_design_report():
             st.session_state.current_section = "System Schedule"
             st.rerun()
     
-    # File uploader for Helioscope PDF
-    uploaded_file = st.file_uploader("Upload Helioscope PDF Report", type=["pdf"])
+    # File uploader for the design report of any supported tool
+    supported_tools = ", ".join(parser.tool for parser in PARSERS.values())
+    uploaded_file = st.file_uploader(f"Upload Design Report PDF ({supported_tools})", type=["pdf"])
     
     if uploaded_file is not None:
-        with st.spinner("Extracting data from PDF..."):
-            # Read the PDF content
-            pdf_content = uploaded_file.read()
+        with st.spinner("Reading PDF..."):
+            # Small reports are read into memory; large ones are spooled to disk and paged from there
+            timer = StageTimer()
+            source, cache_key = get_upload_source(uploaded_file, timer)
             
             # Extract data from PDF
-            extracted_data = extract_helioscope_data(pdf_content)
+            extracted_data = extract_helioscope_data(source, cache_key, timer)
             
-            if extracted_data:
+            job = st.session_state.extraction_job
+            if extracted_data is None and job is not None:
+                # Still running in the background; the page is polled until it finishes
+                progress = job["progress"]
+                fraction = progress["pages_read"] / progress["page_count"] if progress["page_count"] else 0.0
+                st.progress(
+                    fraction,
+                    text=f"Extracting data from PDF... page {progress['pages_read']} of {progress['page_count'] or '?'}"
+                )
+            elif extracted_data:
                 st.session_state.helioscope_data = extracted_data
-                st.success("Data extracted successfully!")
+                extraction = st.session_state.helioscope_extraction
+                st.success(
+                    f"Data extracted successfully from the {extraction.source_tool} report! "
+                    f"(read {extraction.pages_read} of {extraction.page_count} pages)"
+                )
+                
+                # A revision of the same project only refreshed the sections it affects
+                revision = st.session_state.revision_changes
+                if revision:
+                    if revision["sections"]:
+                        st.info(
+                            f"Revised report for {revision['project']}: changed {', '.join(revision['changed'])}. "
+                            f"Refreshed {', '.join(revision['sections'])}; other schedule sections were kept."
+                        )
+                    else:
+                        st.info(
+                            f"Revised report for {revision['project']}: no schedule inputs changed, "
+                            f"the System Schedule was kept as is."
+                        )
+                
+                # Debug panel: where the extraction time went, stage by stage
+                if st.checkbox("Show extraction timings", key="show_extraction_timings"):
+                    timings = st.session_state.extraction_timings
+                    source_note = "served from the extraction cache" if timings["cache_hit"] else "extracted"
+                    st.caption(f"Total {timings['total_ms']:.1f} ms, {source_note}")
+                    st.dataframe(pd.DataFrame(timings["stages"]), hide_index=True)
                 
                 # Display extracted data
                 st.subheader("Extracted Data")
@@ -1078,6 +907,7 @@ def show_design_report():
                     
                     # Project Information
                     st.markdown("### 📍 Project Information")
+                    st.write(f"**Source Tool:** {extracted_data.get('SOURCE TOOL', 'N/A')}")
                     st.write(f"**Project Name:** {extracted_data.get('PROJECT NAME', 'N/A')}")
                     st.write(f"**Project Address:** {extracted_data.get('PROJECT ADDRESS', 'N/A')}")
                     st.write(f"**Annual Production (MWh):** {extracted_data.get('ANNUAL PRODUCTION', 'N/A')}")
@@ -1089,28 +919,57 @@ def show_design_report():
                     inverter_data = next((item for item in extracted_data['COMPONENTS'] if item['Component'] == 'Inverters'), None)
                     if inverter_data:
                         st.write(f"**Description:** {inverter_data['Description']}")
-                        st.write(f"**Count:** {inverter_data['Count']}, **Capacity:** {inverter_data['Value']} kW")
+                        st.write(f"**Count:** {inverter_data['Count']:,}, **Capacity:** {inverter_data['Value']:,} kW")
                     
                     # Strings Information
                     st.markdown("### 🔗 Strings Information")
                     strings_data = next((item for item in extracted_data['COMPONENTS'] if item['Component'] == 'Strings'), None)
                     if strings_data:
                         st.write(f"**Description:** {strings_data['Description']}")
-                        st.write(f"**Count:** {strings_data['Count']}, **Length:** {strings_data['Value']} {strings_data['Unit']}")
+                        st.write(f"**Count:** {strings_data['Count']:,}, **Length:** {strings_data['Value']:,} {strings_data['Unit']}")
                     
                     # Module Information
                     st.markdown("### 📦 Module Information")
                     module_data = next((item for item in extracted_data['COMPONENTS'] if item['Component'] == 'Module'), None)
                     if module_data:
                         st.write(f"**Description:** {module_data['Description']}")
-                        st.write(f"**Count:** {module_data['Count']}, **Capacity:** {module_data['Value']} kW")
+                        st.write(f"**Count:** {module_data['Count']:,}, **Capacity:** {module_data['Value']:,} kW")
                 
                 # System Losses
                 if extracted_data.get('SYSTEM LOSSES'):
                     st.write("\n**System Losses**")
                     losses_df = pd.DataFrame(extracted_data['SYSTEM LOSSES'])
                     st.dataframe(losses_df)
+
+                # Wiring Zones
+                if extracted_data.get('WIRING ZONES'):
+                    st.write("\n**Wiring Zones**")
+                    st.dataframe(pd.DataFrame(extracted_data['WIRING ZONES']))
                 
+                # Hourly production from the Helioscope 8760 CSV export, next to the report's figures
+                st.markdown("### 📈 Hourly Production")
+                production_file = st.file_uploader(
+                    "Upload Helioscope hourly production CSV (optional)", type=["csv"], key="hourly_production_csv"
+                )
+                if production_file is not None:
+                    inverter = extraction.inverter
+                    try:
+                        production = load_hourly_production(production_file.getvalue(), inverter.value if inverter else None)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        metrics = st.columns(4)
+                        report_delta = None
+                        if extraction.annual_production is not None:
+                            report_delta = f"{production.annual_mwh - extraction.annual_production:+,.1f} MWh vs report"
+                        metrics[0].metric("Annual energy", f"{production.annual_mwh:,.1f} MWh", delta=report_delta)
+                        metrics[1].metric("Peak AC output", f"{production.peak_ac_kw:,.1f} kW")
+                        metrics[2].metric("Clipping hours", f"{production.clipping_hours:,}")
+                        metrics[3].metric("Hours in file", f"{production.hours:,}")
+                        monthly = production.monthly_frame()
+                        st.bar_chart(monthly, x="Month", y="Energy (MWh)")
+                        st.dataframe(monthly, hide_index=True)
+
                 # Add button to auto-populate system schedule
                 if st.button("Auto-populate System Schedule"):
                     st.session_state.auto_populated = True
@@ -1118,6 +977,11 @@ def show_design_report():
                     st.rerun()
             else:
                 st.error("Failed to extract data from PDF")
+    
+    # Poll the background extraction; the widgets above stay usable between reruns
+    if uploaded_file is not None and st.session_state.extraction_job is not None:
+        time.sleep(EXTRACTION_POLL_SECONDS)
+        st.rerun()
 
 def show_home_page():
     # Centered logo and title
@@ -1128,8 +992,8 @@ def show_home_page():
         </div>
     """, unsafe_allow_html=True)
     
-    # Create two columns for the main sections
-    col1, col2 = st.columns(2)
+    # Create three columns for the main sections
+    col1, col2, col3 = st.columns(3)
     
     with col1:
         # Design Report Section
@@ -1154,6 +1018,80 @@ def show_home_page():
         if st.button("Go to System Schedule", key="system-schedule", use_container_width=True):
             st.session_state.current_section = "System Schedule"
             st.rerun()
+    
+    with col3:
+        # Portfolio Section
+        st.markdown("""
+            <div style='text-align: center;'>
+                <h2 style='color: #1f77b4;'>Portfolio</h2>
+                <p style='color: #555; margin-bottom: 15px;'>Compare every extracted project side by side</p>
+            </div>
+        """, unsafe_allow_html=True)
+        if st.button("Go to Portfolio", key="portfolio", use_container_width=True):
+            st.session_state.current_section = "Portfolio"
+            st.rerun()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_hourly_production(content, ac_capacity_kw):
+    """Summary of an uploaded hourly production CSV, cached by its bytes"""
+    return import_hourly_production(io.BytesIO(content), ac_capacity_kw)
+
+@st.cache_data(show_spinner=False)
+def load_portfolio(entry_count, last_written):
+    """Portfolio frame of every stored extraction; the arguments only key the cache, so it reloads after new extractions"""
+    return portfolio_frame(get_extraction_cache().store.items())
+
+def show_portfolio():
+    st.title("Portfolio")
+    
+    if st.button("← Back to Home", key="portfolio_back_home"):
+        st.session_state.current_section = None
+        st.rerun()
+    
+    store = get_extraction_cache().store
+    frame = load_portfolio(len(store), store.last_written())
+    if frame.empty:
+        st.info("No extracted reports yet. Upload reports on the Design Report page, or load a folder of them with batch_extract.py --cache-db.")
+        return
+    
+    # Revisions of a project are separate cache entries; by default show the latest one
+    if not st.checkbox("Show every revision of a project", value=False):
+        frame = latest_revisions(frame)
+    
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        search = st.text_input("Search project name or address")
+        inverters = st.multiselect("Inverter", sorted(frame["INVERTER (PRODUCT NAME)"].dropna().unique()))
+    with col2:
+        dc_range = None
+        dc_min, dc_max = frame["DC SYSTEM SIZE (kW)"].min(), frame["DC SYSTEM SIZE (kW)"].max()
+        if dc_max > dc_min:
+            dc_range = st.slider("DC system size (kW)", float(dc_min), float(dc_max), (float(dc_min), float(dc_max)))
+        pr_range = None
+        pr_min, pr_max = frame["PERFORMANCE RATIO (%)"].min(), frame["PERFORMANCE RATIO (%)"].max()
+        if pr_max > pr_min:
+            pr_range = st.slider("Performance ratio (%)", float(pr_min), float(pr_max), (float(pr_min), float(pr_max)))
+    filtered = filter_portfolio(frame, search, inverters, dc_range, pr_range)
+    
+    # Sorting
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_column = st.selectbox("Sort by", [column for column in filtered.columns if column != "KEY"], index=2)
+    with col2:
+        descending = st.checkbox("Descending", value=True)
+    filtered = filtered.sort_values(sort_column, ascending=not descending, na_position="last")
+    
+    # Aggregates over the filtered projects
+    totals = portfolio_totals(filtered)
+    metrics = st.columns(5)
+    metrics[0].metric("Projects", totals["projects"])
+    metrics[1].metric("DC size", f"{totals['dc_mw']:,.2f} MW")
+    metrics[2].metric("AC size", f"{totals['ac_mw']:,.2f} MW")
+    metrics[3].metric("Annual production", f"{totals['production_gwh']:,.2f} GWh")
+    metrics[4].metric("Performance ratio", f"{totals['performance_ratio']:.1f}%")
+    
+    st.dataframe(filtered.drop(columns=["KEY"]), hide_index=True, use_container_width=True)
 
 def show_system_schedule():
     st.title("System Schedule")
@@ -1178,8 +1116,8 @@ def show_system_schedule():
             "no_of_mppt": 1
         }
     
-    # Auto-populate data if available
-    auto_populate_system_schedule()
+    # The schedule data was filled from the extracted components by refresh_schedule_section
+    # when the report was applied; filling it again here would undo the user's edits
     
     # Cache the radio selection to improve performance
     if 'system_schedule_page' not in st.session_state:
@@ -1227,15 +1165,14 @@ def show_system_schedule():
                 "SOLAR PV MODULE (PRODUCT NAME)": solar_pv_module,
                 "NO OF SOLAR PV MODULES": no_of_solar_pv_modules,
             }
-            pdf_file = save_to_pdf_page1(data)
-            with open(pdf_file, "rb") as file:
-                st.session_state["pdf_data_page1"] = file.read()
-                st.success("PDF generated successfully!")
+            generate_section("System Summary", data)
+            st.success("PDF generated successfully!")
         
-        if st.session_state.get("pdf_data_page1"):
+        pdf = load_artifact("System Summary")
+        if pdf:
                 st.download_button(
                     "📄 Download System Summary PDF",
-                    data=st.session_state["pdf_data_page1"],
+                    data=pdf,
                     file_name="System_Summary.pdf",
                     mime="application/pdf"
                 )
@@ -1264,16 +1201,14 @@ def show_system_schedule():
         st.dataframe(df)
 
         if st.button("Generate Feed Schedule PDF"):
-            pdf_file = save_to_pdf_page2(df)
-            with open(pdf_file, "rb") as file:
-                st.session_state["pdf_data_page2"] = file.read()
-                st.success("PDF generated successfully!")
-                st.download_button(
-                    "📄 Download Feed Schedule PDF",
-                    data=st.session_state["pdf_data_page2"],
-                    file_name="Feed_Schedule.pdf",
-                    mime="application/pdf"
-                )
+            generate_section("Feed Schedule", df)
+            st.success("PDF generated successfully!")
+            st.download_button(
+                "📄 Download Feed Schedule PDF",
+                data=load_artifact("Feed Schedule"),
+                file_name="Feed_Schedule.pdf",
+                mime="application/pdf"
+            )
     
     elif st.session_state.current_page == "Metco Equipment":
         st.title("METCO Provided Equipment Form")
@@ -1296,17 +1231,17 @@ def show_system_schedule():
                     if equipment == "PV MODULES" and st.session_state.get('component_details', {}).get('module'):
                         manufacturer = st.text_input(
                             f"Manufacturer", 
-                            value=st.session_state.component_details['module']['Description'].split(',')[0].strip(),
+                            value=st.session_state.component_details['module'].description.split(',')[0].strip(),
                             key=f"manufacturer_{equipment}"
                         )
                         model_number = st.text_input(
                             f"Model Number", 
-                            value=st.session_state.component_details['module']['Description'].split(',')[1].strip() if ',' in st.session_state.component_details['module']['Description'] else "",
+                            value=st.session_state.component_details['module'].description.split(',')[1].strip() if ',' in st.session_state.component_details['module'].description else "",
                             key=f"model_{equipment}"
                         )
                     elif equipment == "INVERTERS" and st.session_state.get('component_details', {}).get('inverter'):
                         # Extract manufacturer and model number from inverter description
-                        inverter_desc = st.session_state.component_details['inverter']['Description']
+                        inverter_desc = st.session_state.component_details['inverter'].description
                         
                         # Split by common separators and clean up
                         parts = inverter_desc.replace(' - ', ' ').replace('-', ' ').split()
@@ -1339,16 +1274,14 @@ def show_system_schedule():
             submitted = st.form_submit_button("Generate PDF")
         
         if submitted:
-            pdf_file = generate_equipment_pdf_page3(data)
-            with open(pdf_file, "rb") as file:
-                st.session_state["pdf_page3"] = file.read()
-                st.success("PDF generated successfully!")
-                st.download_button(
-                    "📄 Download Equipment PDF",
-                    data=st.session_state["pdf_page3"],
-                    file_name="Metco_Equipment.pdf",
-                    mime="application/pdf"
-                )
+            generate_section("Metco Equipment", data)
+            st.success("PDF generated successfully!")
+            st.download_button(
+                "📄 Download Equipment PDF",
+                data=load_artifact("Metco Equipment"),
+                file_name="Metco_Equipment.pdf",
+                mime="application/pdf"
+            )
 
     elif st.session_state.current_page == "Inverter Schedule":
         st.title("Inverter Schedule Form")
@@ -1393,15 +1326,14 @@ def show_system_schedule():
             submitted = st.form_submit_button("Generate PDF")
             
             if submitted:
-                pdf_file = generate_pdf_page4(df)
-                with open(pdf_file, "rb") as file:
-                    st.session_state["pdf_page4"] = file.read()
-                    st.success("PDF generated successfully!")
+                generate_section("Inverter Schedule", df)
+                st.success("PDF generated successfully!")
         
-        if st.session_state.get("pdf_page4"):
+        pdf = load_artifact("Inverter Schedule")
+        if pdf:
             st.download_button(
                 "📄 Download Inverter Schedule PDF",
-                data=st.session_state["pdf_page4"],
+                data=pdf,
                 file_name="inverter_schedule.pdf",
                 mime="application/pdf"
             )
@@ -1446,9 +1378,9 @@ def show_system_schedule():
             
             if st.session_state.get('component_details', {}).get('strings'):
                 string_data = st.session_state.component_details['strings']
-                string_count = int(string_data['Count'])  # Use actual count from PDF if available
-                string_description = string_data['Description']
-                string_length = f"{string_data['Value']} {string_data['Unit']}"
+                string_count = string_data.count  # Use actual count from PDF if available
+                string_description = string_data.description
+                string_length = f"{string_data.value:,} {string_data.unit}"
             
             no_of_strings_used = st.number_input(
                 "Enter number of Strings used from report:", 
@@ -1501,17 +1433,16 @@ def show_system_schedule():
                 st.session_state.string_table_df = df
         
                 # Generate PDF when table is generated
-                pdf_file = create_pdf_page5(st.session_state.string_table_df)
-                with open(pdf_file, "rb") as file:
-                    st.session_state["pdf_page5"] = file.read()
-                    st.success("PDF generated successfully!")
+                generate_section("String Table", st.session_state.string_table_df)
+                st.success("PDF generated successfully!")
             except Exception as e:
                 st.error(f"Error generating string table: {str(e)}")
         
-        if st.session_state.get("pdf_page5"):
+        pdf = load_artifact("String Table")
+        if pdf:
             st.download_button(
                 "📄 Download String Table PDF",
-                data=st.session_state["pdf_page5"],
+                data=pdf,
                 file_name="stringing_table.pdf",
                 mime="application/pdf"
             )
@@ -1610,51 +1541,52 @@ def show_system_schedule():
                 "PH": ph,
                 "Wire": wire
             }
-            pdf_file = generate_pdf_page6(panel_details, edited_df)
-            with open(pdf_file, "rb") as f:
-                st.success("PDF generated successfully!")
-                st.download_button(
-                    "📄 Download Panel Schedule PDF",
-                    data=f.read(),
-                    file_name="panel_schedule.pdf",
-                    mime="application/pdf"
-                )
+            generate_section("Panel Schedule", panel_details, edited_df)
+            st.success("PDF generated successfully!")
+            st.download_button(
+                "📄 Download Panel Schedule PDF",
+                data=load_artifact("Panel Schedule"),
+                file_name="panel_schedule.pdf",
+                mime="application/pdf"
+            )
 
     elif st.session_state.current_page == "Download Combined PDF":
         st.title("Download Complete System Report")
         
-        required_pdfs = [
-            "System_Summary.pdf",
-            "Feed_Schedule.pdf",
-            "Metco_Equipment.pdf",
-            "inverter_schedule.pdf",
-            "stringing_table.pdf",
-            "panel_schedule.pdf"
-        ]
+        # A section is complete while the artifact store still holds its PDF; its inputs,
+        # kept for this project when the PDF was generated, are dropped once the PDF expires
+        session_id, project = artifact_scope()
+        stored = get_artifact_store().available(session_id, project, [section for section, _ in REPORT_SECTIONS])
+        for section, _ in REPORT_SECTIONS:
+            if section not in stored:
+                st.session_state.report_inputs.pop((project, section), None)
+        section_inputs = [st.session_state.report_inputs.get((project, section)) for section, _ in REPORT_SECTIONS]
         
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("### Required Components")
-            for pdf in required_pdfs:
-                if os.path.exists(pdf):
-                    st.success(f"✅ {pdf}")
+            for (_, file_name), inputs in zip(REPORT_SECTIONS, section_inputs):
+                if inputs is not None:
+                    st.success(f"✅ {file_name}")
                 else:
-                    st.error(f"❌ {pdf} (Missing)")
+                    st.error(f"❌ {file_name} (Missing)")
         
         with col2:
             st.markdown("### Actions")
-            if all(os.path.exists(pdf) for pdf in required_pdfs):
+            if all(inputs is not None for inputs in section_inputs):
                 try:
-                    combined_pdf = merge_pdfs(required_pdfs)
-                    if combined_pdf and os.path.exists(combined_pdf):
-                        with open(combined_pdf, "rb") as file:
-                            st.download_button(
-                                "📥 Download Complete System Report",
-                                data=file.read(),
-                                file_name="Solar_System_Report.pdf",
-                                mime="application/pdf",
-                                key="download_complete"
-                            )
+                    # Render every section into one document rather than merging their PDFs,
+                    # reusing the last render while no section changes
+                    sections = [(section, inputs) for (section, _), inputs in zip(REPORT_SECTIONS, section_inputs)]
+                    combined_pdf = cached_render("Combined Report", sections, lambda: render_report(sections))
+                    if combined_pdf:
+                        st.download_button(
+                            "📥 Download Complete System Report",
+                            data=combined_pdf,
+                            file_name="Solar_System_Report.pdf",
+                            mime="application/pdf",
+                            key="download_complete"
+                        )
                 except Exception as e:
                     st.error(f"Error creating combined PDF: {str(e)}")
                     st.warning("Please try generating the report again.")
@@ -1675,6 +1607,8 @@ def main():
         show_system_schedule()
     elif st.session_state.current_section == "Design Report":
         show_design_report()
+    elif st.session_state.current_section == "Portfolio":
+        show_portfolio()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""Process-wide store of generated files (section PDFs), keyed by session and project or by a shared key"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Total bytes of distinct files kept before the least recently used go
+DEFAULT_MAX_BYTES = int(os.environ.get("ARTIFACT_STORE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Files not stored or read for this long are dropped, covering sessions that ended
+DEFAULT_MAX_AGE_SECONDS = 6 * 60 * 60
+
+# First part of the names of contents stored under a shared key, never a session id
+_SHARED = object()
+
+
+class ArtifactStore:
+    """Thread-safe, content-addressed store of the files each session generates.
+
+    An artifact is named by (session id, project, section), so concurrent
+    sessions, and one session's different projects, never see each other's
+    files. Contents are stored once per SHA-256 digest, so identical PDFs
+    generated by many sessions (e.g. the static Feed Schedule) share one copy.
+    Contents can also be stored under a key of no session (put_shared), such
+    as the render key of the inputs a PDF was rendered from, which shares the
+    copy of every session that stored the same PDF. Contents are dropped least
+    recently used first beyond max_bytes, and names not used for max_age
+    seconds expire.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE_SECONDS):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # digest -> content, least recently used first
+        self._blobs = OrderedDict()
+        # (session id, project, section), or (_SHARED, key) -> [digest, last used]
+        self._names = {}
+        # digest -> number of names referring to it
+        self._refs = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, session_id, project, section, content):
+        """Store content under the name, returning its digest"""
+        return self._put((session_id, project, section), content)
+
+    def get(self, session_id, project, section):
+        """Content stored under the name, or None when missing, expired or evicted"""
+        return self._get((session_id, project, section))
+
+    def put_shared(self, key, content):
+        """Store content under a key seen by every session, returning its digest"""
+        return self._put((_SHARED, key), content)
+
+    def get_shared(self, key):
+        """Content stored with put_shared under the key, or None when missing, expired or evicted"""
+        return self._get((_SHARED, key))
+
+    def _put(self, name, content):
+        digest = hashlib.sha256(content).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            previous = self._names.get(name)
+            if previous is None or previous[0] != digest:
+                if previous is not None:
+                    self._release(previous[0])
+                self._refs[digest] = self._refs.get(digest, 0) + 1
+            if digest in self._blobs:
+                self._blobs.move_to_end(digest)
+            else:
+                self._blobs[digest] = content
+                self._size += len(content)
+            self._names[name] = [digest, now]
+            self._evict(now)
+        return digest
+
+    def _get(self, name):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._names.get(name)
+            if entry is None:
+                return None
+            digest, last_used = entry
+            if now - last_used > self.max_age or digest not in self._blobs:
+                self._discard(name)
+                return None
+            entry[1] = now
+            self._blobs.move_to_end(digest)
+            return self._blobs[digest]
+
+    def available(self, session_id, project, sections):
+        """The sections stored for a session's project, as a set"""
+        return {section for section in sections if self.get(session_id, project, section) is not None}
+
+    def discard(self, session_id, project, section):
+        """Forget the name; its content goes once no other name refers to it"""
+        with self._lock:
+            self._discard((session_id, project, section))
+
+    def _discard(self, name):
+        entry = self._names.pop(name, None)
+        if entry is not None:
+            self._release(entry[0])
+
+    def _release(self, digest):
+        # Drop one reference to the content, and the content with the last one
+        self._refs[digest] -= 1
+        if not self._refs[digest]:
+            del self._refs[digest]
+            self._size -= len(self._blobs.pop(digest, b""))
+
+    def _evict(self, now):
+        # Expire idle names (and contents only they referred to), then trim to max_bytes
+        for name in [name for name, (_, last_used) in self._names.items() if now - last_used > self.max_age]:
+            self._discard(name)
+        evicted = set()
+        while self._size > self.max_bytes and len(self._blobs) > 1:
+            digest, content = self._blobs.popitem(last=False)
+            self._size -= len(content)
+            evicted.add(digest)
+        if evicted:
+            self._names = {name: entry for name, entry in self._names.items() if entry[0] not in evicted}
+            for digest in evicted:
+                del self._refs[digest]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._blobs)
+
+    @property
+    def size(self):
+        """Bytes of distinct contents held"""
+        with self._lock:
+            return self._size
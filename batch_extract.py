@@ -0,0 +1,163 @@
+"""Extract many design reports (Helioscope, PVsyst, Aurora) at once.
+
+    python batch_extract.py reports/ "archive/**/*.pdf" -o projects.csv --workers 8
+
+Writes one row per report (JSON lines or CSV, chosen by the output extension
+or --format) and prints throughput and per-file timing to stderr.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from extraction_cache import PersistentExtractionCache, file_content_key
+from helioscope_extractor import EXTRACTOR_VERSION, HelioscopeExtraction, project_summary
+from report_parsers import extract_report as extract_design_report
+
+# project_summary columns holding whole counts
+COUNT_COLUMNS = ["NO OF INVERTERS", "NO OF SOLAR PV MODULES", "NO OF STRINGS"]
+
+
+def find_reports(inputs):
+    """PDF paths named by inputs: files, directories (searched recursively) or glob patterns"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True))
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            paths.extend(glob.glob(item, recursive=True))
+    # Keep the first occurrence of each file, in a stable order
+    return list(dict.fromkeys(sorted(os.path.normpath(path) for path in paths)))
+
+
+def extract_report(path):
+    """Worker: extract one report, returning its extraction (or error) and the time taken"""
+    start = time.perf_counter()
+    try:
+        extraction = extract_design_report(path)
+        error = None
+    except Exception as e:
+        extraction = None
+        error = str(e)
+    return extraction, error, time.perf_counter() - start
+
+
+def report_row(path, extraction, error, seconds, cached):
+    row = {"FILE": path}
+    # Failed reports get the same (empty) columns so every row lines up
+    row.update(project_summary(extraction or HelioscopeExtraction()))
+    if extraction is None:
+        row["SOURCE TOOL"] = None
+    row["SYSTEM LOSSES"] = json.dumps([loss.to_dict() for loss in extraction.system_losses]) if extraction else None
+    row["ERROR"] = error
+    row["CACHED"] = cached
+    row["SECONDS"] = round(seconds, 4)
+    return row
+
+
+def run(paths, workers, cache=None, progress=None):
+    """Extract every path across a process pool, returning rows in input order"""
+    rows = [None] * len(paths)
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, path in enumerate(paths):
+            key = file_content_key(path, EXTRACTOR_VERSION) if cache is not None else None
+            extraction = cache.get(key) if cache is not None else None
+            if extraction is not None:
+                rows[index] = report_row(path, extraction, None, 0.0, True)
+                continue
+            pending[executor.submit(extract_report, path)] = (index, path, key)
+
+        for done, future in enumerate(as_completed(pending), start=1):
+            index, path, key = pending[future]
+            extraction, error, seconds = future.result()
+            if cache is not None and extraction is not None:
+                cache.put(key, extraction)
+            rows[index] = report_row(path, extraction, error, seconds, False)
+            if progress:
+                progress(done, len(pending), path)
+    return rows
+
+
+def write_rows(rows, output, output_format):
+    if output_format == "csv":
+        frame = pd.DataFrame(rows)
+        # A failed report leaves its counts empty, which would turn the whole column to floats ("3.0")
+        frame[COUNT_COLUMNS] = frame[COUNT_COLUMNS].astype("Int64")
+        frame.to_csv(output or sys.stdout, index=False)
+        return
+    lines = "".join(json.dumps(row) + "\n" for row in rows)
+    if output:
+        with open(output, "w") as file:
+            file.write(lines)
+    else:
+        sys.stdout.write(lines)
+
+
+def print_stats(rows, wall_seconds):
+    parsed = [row["SECONDS"] for row in rows if not row["CACHED"] and row["ERROR"] is None]
+    failed = sum(1 for row in rows if row["ERROR"] is not None)
+    cached = sum(1 for row in rows if row["CACHED"])
+    print(
+        f"{len(rows)} reports in {wall_seconds:.2f}s "
+        f"({len(rows) / wall_seconds if wall_seconds else 0:.1f} reports/s): "
+        f"{len(parsed)} parsed, {cached} cached, {failed} failed",
+        file=sys.stderr
+    )
+    if parsed:
+        print(
+            f"per report: mean {statistics.mean(parsed):.3f}s, median {statistics.median(parsed):.3f}s, "
+            f"max {max(parsed):.3f}s",
+            file=sys.stderr
+        )
+    for row in rows:
+        if row["ERROR"] is not None:
+            print(f"failed: {row['FILE']}: {row['ERROR']}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract project data from many design report PDFs")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="output format (default: from the extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--cache-db", help="SQLite extraction cache shared with the app, e.g. .cache/extractions.sqlite3")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if (args.output or "").endswith(".csv") else "jsonl")
+    paths = find_reports(args.inputs)
+    if not paths:
+        parser.error("no PDF reports found")
+
+    cache = None
+    if args.cache_db:
+        cache = PersistentExtractionCache(
+            args.cache_db,
+            EXTRACTOR_VERSION,
+            serialize=HelioscopeExtraction.to_json,
+            deserialize=HelioscopeExtraction.from_json
+        )
+
+    start = time.perf_counter()
+    rows = run(
+        paths,
+        args.workers,
+        cache=cache,
+        progress=lambda done, total, path: print(f"[{done}/{total}] {path}", file=sys.stderr)
+    )
+    wall_seconds = time.perf_counter() - start
+    write_rows(rows, args.output, output_format)
+    print_stats(rows, wall_seconds)
+    return 1 if any(row["ERROR"] is not None for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
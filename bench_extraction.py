@@ -0,0 +1,358 @@
+"""Benchmarks for the Helioscope extraction core.
+
+    python bench_extraction.py scanner --pages 5 50 500
+    python bench_extraction.py locator --pages 5 50 500
+    python bench_extraction.py losses --words 1000 4000 16000 64000
+    python bench_extraction.py early-exit --pages 5 50 500
+    python bench_extraction.py corpus [corpus/]
+    python bench_extraction.py parallel --pages 50 100 500 1000
+"""
+import argparse
+import glob
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+import fitz  # PyMuPDF
+
+from helioscope_extractor import (
+    ComponentRow,
+    HelioscopeExtraction,
+    LossRow,
+    PARALLEL_PAGE_THRESHOLD,
+    PARALLEL_WORKERS,
+    extract_helioscope,
+    get_process_pool,
+    parse_helioscope_text,
+    read_page_texts,
+    read_pdf_text,
+)
+from synthetic_reports import ACCURACY_FIELDS, ReportSpec, corpus_specs, field_accuracy, generate_corpus, generate_report
+
+PROJECT_PAGE = """HelioScope Design Report
+Project Name
+Sunny Acres Solar
+Project Address
+123 Main Street
+Springfield, IL 62701 USA
+Annual Production
+250.5 MWh
+Performance Ratio
+82.3%
+Weather Dataset
+TMY, 10km grid (39.75,-89.65), NREL (prospector)
+Simulator Version
+5f1c2e
+"""
+
+COMPONENTS_PAGE = """System Losses
+Shading Loss
+3.2%
+Soiling Loss
+2.0%
+Module Degradation
+0.5%
+Wiring Loss
+0.4%
+Components
+Component
+Name
+Count
+Inverters
+CPS SCA50KTL-DO/US-480 (CPS)
+3 (150.0 kW)
+Strings
+10 AWG (Copper)
+21 (4,200.3 ft)
+Module
+Sunsprint Engineering, SPISLE575-144TGG (575W)
+315 (181.1 kW)
+"""
+
+APPENDIX_PAGE = """Shading Appendix
+Field Segment {page} Azimuth 180 Tilt 10 Solar Access 97.4% Avg TSRF 91.2%
+""" + "Hourly shading of the field segment on the winter solstice morning hours\n" * 40
+
+
+def synthetic_page_texts(pages):
+    """Page texts of a Helioscope-style report padded with shading appendix pages"""
+    texts = [PROJECT_PAGE, COMPONENTS_PAGE]
+    texts.extend(APPENDIX_PAGE.format(page=page) for page in range(2, pages))
+    return texts[:pages]
+
+
+def synthetic_report_text(pages):
+    """Joined text of a synthetic report, as get_text() over every page would give"""
+    return "\n".join(synthetic_page_texts(pages))
+
+
+def synthetic_report_pdf(pages):
+    """Bytes of a plain-text PDF with one synthetic report page per page"""
+    with fitz.open() as doc:
+        for text in synthetic_page_texts(pages):
+            doc.new_page().insert_text((40, 40), text, fontsize=7)
+        return doc.tobytes()
+
+
+def parse_helioscope_text_regex(text):
+    """The original sequential regex battery, kept as the benchmark baseline"""
+    fields = {}
+    project_name = re.search(r"Project Name\s+(.*)", text)
+    address = re.search(r"Project\s+Address\s+(.*?)\s+USA", text, re.DOTALL)
+    if project_name: fields["project_name"] = project_name.group(1).strip()
+    if address: fields["project_address"] = address.group(1).replace('\n', ', ').strip()
+    production = re.search(r"Annual\s+Production\s+([\d.]+)\s+MWh", text)
+    ratio = re.search(r"Performance\s+Ratio\s+([\d.]+)%", text)
+    if production: fields["annual_production"] = float(production.group(1))
+    if ratio: fields["performance_ratio"] = float(ratio.group(1))
+    weather = re.search(r"Weather Dataset\s+(.+?)\s+Simulator Version", text, re.DOTALL)
+    if weather: fields["weather_dataset"] = weather.group(1).replace("\n", " ").strip()
+    component_block = re.findall(
+        r"(Inverters|Strings[^\n]*?|Module)\s+([A-Za-z0-9\-/,().\s]+?)\s+(\d+)\s+\(([\d.,]+)\s*(kW|ft)\)",
+        text
+    )
+    components = tuple(ComponentRow.parse(*comp) for comp in component_block)
+    system_losses = tuple(
+        LossRow(loss_type.strip(), float(loss_value))
+        for loss_type, loss_value in re.findall(r"([A-Za-z\s]+)\s+([\d.]+)%", text)
+        if "loss" in loss_type.lower() or "degradation" in loss_type.lower()
+    )
+    return HelioscopeExtraction(components=components, system_losses=system_losses, **fields)
+
+
+def pathological_losses_text(words):
+    """A losses table followed by a long run of words and spaces that never reaches a %"""
+    return "System Losses\nSoiling Loss\n2.0%\n" + "shading loss on the array " * (words // 5) + "1.0\n"
+
+
+def parse_losses_regex(text):
+    """The original losses regex, kept as the benchmark baseline"""
+    return [
+        (loss_type.strip(), loss_value)
+        for loss_type, loss_value in re.findall(r"([A-Za-z\s]+)\s+([\d.]+)%", text)
+        if "loss" in loss_type.lower() or "degradation" in loss_type.lower()
+    ]
+
+
+def without_read_stats(extraction):
+    """The extraction with its page counters cleared, for comparing results of different read paths"""
+    return replace(extraction, pages_read=0, page_count=0)
+
+
+def best_of(repeat, func, *args):
+    """Fastest of repeat runs, in seconds, and the last result"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# Run in a fresh interpreter for each report: peak RSS in KiB once the extractor
+# is imported, and again after extracting the report. VmHWM covers this process
+# image alone; ru_maxrss carries over the peak of the process it was forked
+# from, so it is only the fallback where there is no /proc.
+RSS_PROBE = """
+import resource, sys
+from helioscope_extractor import extract_helioscope
+
+def peak_rss():
+    try:
+        with open("/proc/self/status") as status:
+            return next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+before = peak_rss()
+extract_helioscope(sys.argv[1])
+print(before, peak_rss())
+"""
+
+
+def peak_rss(path):
+    """Peak RSS in KiB of a process extracting one report, and how much of it the extraction added.
+
+    Unlike tracemalloc this counts MuPDF's own buffers, not just Python objects.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", RSS_PROBE, os.path.abspath(path)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+    ).stdout
+    # The last line: PyMuPDF may print its own warnings first
+    before, after = map(int, output.splitlines()[-1].split())
+    return after, after - before
+
+
+def bench_scanner(pages_list, repeat, baseline_max_pages):
+    # "same" compares everything but the losses, which the scanner reads from the
+    # System Losses table rather than from every percentage in the text
+    print(f"{'pages':>6} {'chars':>10} {'regex ms':>10} {'scanner ms':>11} {'speedup':>8}  same")
+    for pages in pages_list:
+        text = synthetic_report_text(pages)
+        scanner_time, scanner_result = best_of(repeat, parse_helioscope_text, text)
+        # The losses regex backtracks quadratically on appendix prose, so the
+        # baseline is only timed (once) on reports it can finish in reasonable time
+        if pages > baseline_max_pages:
+            print(f"{pages:>6} {len(text):>10} {'-':>10} {scanner_time * 1000:>11.2f} {'-':>8}  -")
+            continue
+        regex_time, regex_result = best_of(1, parse_helioscope_text_regex, text)
+        print(
+            f"{pages:>6} {len(text):>10} {regex_time * 1000:>10.2f} {scanner_time * 1000:>11.2f} "
+            f"{regex_time / scanner_time:>7.1f}x  "
+            f"{replace(regex_result, system_losses=()) == replace(scanner_result, system_losses=())}"
+        )
+
+
+def bench_locator(pages_list, repeat):
+    print(f"{'pages':>6} {'all pages ms':>13} {'located ms':>11} {'speedup':>8}  same")
+    for pages in pages_list:
+        pdf_content = synthetic_report_pdf(pages)
+        full_time, full_result = best_of(
+            repeat, lambda content: parse_helioscope_text(read_pdf_text(content)), pdf_content
+        )
+        located_time, located_result = best_of(
+            repeat, lambda content: extract_helioscope(content, early_exit=False), pdf_content
+        )
+        print(
+            f"{pages:>6} {full_time * 1000:>13.2f} {located_time * 1000:>11.2f} "
+            f"{full_time / located_time:>7.1f}x  {full_result == without_read_stats(located_result)}"
+        )
+
+
+def bench_early_exit(pages_list, repeat):
+    # Synthetic reports rather than synthetic_report_pdf: early exit waits for the
+    # Wiring Zones table, which only they lay out as a table
+    print(f"{'pages':>6} {'located ms':>11} {'read':>5} {'early exit ms':>14} {'read':>5} {'speedup':>8}  same")
+    for pages in pages_list:
+        pdf_content, _ = generate_report(ReportSpec(pages=pages))
+        located_time, located_result = best_of(
+            repeat, lambda content: extract_helioscope(content, early_exit=False), pdf_content
+        )
+        early_time, early_result = best_of(repeat, extract_helioscope, pdf_content)
+        print(
+            f"{pages:>6} {located_time * 1000:>11.2f} {located_result.pages_read:>5} "
+            f"{early_time * 1000:>14.2f} {early_result.pages_read:>5} {located_time / early_time:>7.1f}x  "
+            f"{without_read_stats(located_result) == without_read_stats(early_result)}"
+        )
+
+
+def bench_losses(words_list, repeat, baseline_max_words):
+    print(f"{'words':>7} {'chars':>9} {'regex ms':>10} {'parser ms':>10} {'parser ns/char':>15}")
+    for words in words_list:
+        text = pathological_losses_text(words)
+        parser_time, result = best_of(repeat, parse_helioscope_text, text)
+        assert [loss.loss_type for loss in result.system_losses] == ["Soiling Loss"]
+        regex_ms = "-"
+        if words <= baseline_max_words:
+            regex_time, _ = best_of(1, parse_losses_regex, text)
+            regex_ms = f"{regex_time * 1000:.2f}"
+        print(
+            f"{words:>7} {len(text):>9} {regex_ms:>10} {parser_time * 1000:>10.2f} "
+            f"{parser_time * 1e9 / len(text):>15.1f}"
+        )
+
+
+def bench_corpus(directory, repeat):
+    if directory is None:
+        temporary = tempfile.TemporaryDirectory()
+        directory = temporary.name
+        generate_corpus(directory, corpus_specs([5, 50, 200], [3, 8], [5, 14]))
+    paths = sorted(glob.glob(os.path.join(directory, "*.pdf")))
+    print(f"{'report':<16} {'pages':>6} {'read':>5} {'ms':>8} {'RSS MiB':>8} {'+KiB':>7} {'fields':>7}")
+    times = []
+    peaks = []
+    correct = {name: 0 for name in ACCURACY_FIELDS}
+    for path in paths:
+        with open(path[:-len(".pdf")] + ".json") as file:
+            truth = HelioscopeExtraction.from_json(file.read())
+        seconds, extraction = best_of(repeat, extract_helioscope, path)
+        peak, growth = peak_rss(path)
+        accuracy = field_accuracy(extraction, truth)
+        for name, right in accuracy.items():
+            correct[name] += right
+        times.append(seconds)
+        peaks.append(peak)
+        print(
+            f"{os.path.basename(path):<16} {extraction.page_count:>6} {extraction.pages_read:>5} "
+            f"{seconds * 1000:>8.2f} {peak / 1024:>8.1f} {growth:>7} {sum(accuracy.values()):>4}/{len(accuracy)}"
+        )
+    print(
+        f"\n{len(paths)} reports: mean {sum(times) / len(times) * 1000:.2f} ms, "
+        f"max {max(times) * 1000:.2f} ms, max peak RSS {max(peaks) / 1024:.1f} MiB"
+    )
+    for name in ACCURACY_FIELDS:
+        print(f"  {name:<18} {correct[name] / len(paths):>7.1%}")
+
+
+def bench_parallel(pages_list, repeat):
+    print(f"workers={PARALLEL_WORKERS} current threshold={PARALLEL_PAGE_THRESHOLD} pages")
+    if PARALLEL_WORKERS < 2:
+        print("single core: map_pages stays serial, both columns time the same path")
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}  same")
+    # Start the workers up front; the pool is shared for the life of the process
+    get_process_pool().submit(os.getpid).result()
+    for pages in pages_list:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.pdf")
+            with open(path, "wb") as file:
+                file.write(synthetic_report_pdf(pages))
+            page_numbers = range(pages)
+            serial_time, serial_texts = best_of(
+                repeat, lambda: read_page_texts(path, page_numbers)
+            )
+            # threshold=0 sends every size to the pool, to find where it starts paying off
+            parallel_time, parallel_texts = best_of(
+                repeat, lambda: read_page_texts(path, page_numbers, parallel=True, threshold=0)
+            )
+        print(
+            f"{pages:>6} {serial_time * 1000:>10.2f} {parallel_time * 1000:>12.2f} "
+            f"{serial_time / parallel_time:>7.1f}x  {serial_texts == parallel_texts}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    scanner = subparsers.add_parser("scanner", help="regex battery vs single-pass scanner on report text")
+    scanner.add_argument("--pages", type=int, nargs="+", default=[5, 50, 500])
+    scanner.add_argument("--repeat", type=int, default=5)
+    scanner.add_argument("--baseline-max-pages", type=int, default=50)
+    locator = subparsers.add_parser("locator", help="every page vs located section pages on PDFs")
+    locator.add_argument("--pages", type=int, nargs="+", default=[5, 50, 500])
+    locator.add_argument("--repeat", type=int, default=3)
+    losses = subparsers.add_parser("losses", help="losses regex vs linear parser on pathological text")
+    losses.add_argument("--words", type=int, nargs="+", default=[1000, 4000, 16000, 64000])
+    losses.add_argument("--repeat", type=int, default=5)
+    losses.add_argument("--baseline-max-words", type=int, default=4000)
+    early_exit = subparsers.add_parser("early-exit", help="located section pages vs reading until complete")
+    early_exit.add_argument("--pages", type=int, nargs="+", default=[5, 50, 500])
+    early_exit.add_argument("--repeat", type=int, default=3)
+    corpus = subparsers.add_parser("corpus", help="time, peak memory and field accuracy on synthetic reports")
+    corpus.add_argument("directory", nargs="?", help="corpus from synthetic_reports.py (default: generate one)")
+    corpus.add_argument("--repeat", type=int, default=3)
+    parallel = subparsers.add_parser("parallel", help="serial vs process-pool page text extraction")
+    parallel.add_argument("--pages", type=int, nargs="+", default=[50, 100, 500, 1000])
+    parallel.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.benchmark == "scanner":
+        bench_scanner(args.pages, args.repeat, args.baseline_max_pages)
+    elif args.benchmark == "locator":
+        bench_locator(args.pages, args.repeat)
+    elif args.benchmark == "losses":
+        bench_losses(args.words, args.repeat, args.baseline_max_words)
+    elif args.benchmark == "early-exit":
+        bench_early_exit(args.pages, args.repeat)
+    elif args.benchmark == "corpus":
+        bench_corpus(args.directory, args.repeat)
+    elif args.benchmark == "parallel":
+        bench_parallel(args.pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
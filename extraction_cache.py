@@ -0,0 +1,184 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Number of extraction results kept in memory before the least recently used is dropped
+DEFAULT_MAX_ENTRIES = 64
+
+# Total payload bytes kept in the on-disk cache before the least recently used entries go
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def digest_key(digest, extractor_version):
+    """Build a cache key from a SHA-256 hex digest of the PDF and the extractor version"""
+    return f"{extractor_version}:{digest}"
+
+
+def content_key(pdf_content, extractor_version):
+    """Build a cache key from the SHA-256 of the PDF bytes and the extractor version"""
+    return digest_key(hashlib.sha256(pdf_content).hexdigest(), extractor_version)
+
+
+def file_content_key(path, extractor_version):
+    """content_key of a PDF on disk, hashed in chunks instead of read whole"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest_key(digest.hexdigest(), extractor_version)
+
+
+class ExtractionCache:
+    """Thread-safe LRU cache of extraction results shared by every session in the process.
+
+    With a store (e.g. a PersistentExtractionCache), misses fall through to it
+    and new results are written to it as well.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, store=None):
+        self.max_entries = max_entries
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached result for key (marking it most recently used) or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        value = self.store.get(key) if self.store is not None else None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entries above max_entries"""
+        self._remember(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def warm(self, limit):
+        """Load the limit most recently used results of the store into memory"""
+        if self.store is None:
+            return 0
+        entries = self.store.recent(limit)
+        # Oldest first, so the most recent entry ends up most recently used
+        for key, value in reversed(entries):
+            self._remember(key, value)
+        return len(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class PersistentExtractionCache:
+    """SQLite-backed extraction cache that survives app restarts.
+
+    Values are stored as text produced by serialize and read back with
+    deserialize. Entries written by another extractor version are dropped on
+    open, and the least recently used entries are evicted once the payloads
+    exceed max_bytes.
+    """
+
+    def __init__(self, path, extractor_version, serialize, deserialize, max_bytes=DEFAULT_MAX_BYTES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.extractor_version = extractor_version
+        self.max_bytes = max_bytes
+        self._serialize = serialize
+        self._deserialize = deserialize
+        self._lock = threading.Lock()
+        # Shared by the Streamlit script threads; access is serialized by the lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY, version TEXT NOT NULL, payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed)")
+            self._connection.execute("DELETE FROM extractions WHERE version != ?", (extractor_version,))
+
+    def get(self, key):
+        """Return the stored result for key, or None"""
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT payload FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE extractions SET accessed = ? WHERE key = ?", (time.time(), key))
+        return self._deserialize(row[0])
+
+    def put(self, key, value):
+        """Store a result and evict the least recently used entries above max_bytes"""
+        payload = self._serialize(value)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extractions (key, version, payload, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.extractor_version, payload, len(payload), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._connection.execute("SELECT key, size FROM extractions ORDER BY accessed").fetchall():
+            self._connection.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def recent(self, limit):
+        """The limit most recently used (key, value) pairs, most recent first"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, payload FROM extractions ORDER BY accessed DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [(key, self._deserialize(payload)) for key, payload in rows]
+
+    def items(self):
+        """Every stored (key, value) pair, most recently used first"""
+        with self._lock:
+            rows = self._connection.execute("SELECT key, payload FROM extractions ORDER BY accessed DESC").fetchall()
+        return [(key, self._deserialize(payload)) for key, payload in rows]
+
+    def last_written(self):
+        """Time of the newest entry (0 when empty), to tell whether anything was added since"""
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(MAX(created), 0) FROM extractions").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
@@ -0,0 +1,799 @@
+"""Helioscope report extraction core, kept free of Streamlit so it can run anywhere"""
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+from helioscope_tables import LayoutTables, component_rows
+from stage_timing import NULL_TIMER
+
+# Bump whenever the parsing logic changes so stale cached results are not served
+EXTRACTOR_VERSION = "11"
+
+
+class UnsupportedReportError(ValueError):
+    """The PDF is not a design report any of the extractors can read"""
+
+
+def _parse_number(text):
+    # "4,200.3" -> 4200.3; None when the text is not a number
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentRow:
+    """One row of the Components table, with its count and value already parsed"""
+    component: str
+    description: str
+    count: int
+    value: float
+    unit: str
+
+    @classmethod
+    def parse(cls, component, description, count, value, unit):
+        """Row from the text of its cells ("Module", "...", "315", "1,181.1", "kW"), or None if the numbers do not parse"""
+        value = _parse_number(value)
+        if value is None or not count.isdigit():
+            return None
+        return cls(component.strip(), description.strip(), int(count), value, unit.strip())
+
+    def to_dict(self):
+        return {
+            "Component": self.component,
+            "Description": self.description,
+            "Count": self.count,
+            "Value": self.value,
+            "Unit": self.unit
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class LossRow:
+    """One system loss entry"""
+    loss_type: str
+    loss_percent: float
+
+    def to_dict(self):
+        return {
+            "Loss Type": self.loss_type,
+            "Loss (%)": f"{self.loss_percent:g}%"
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class WiringZoneRow:
+    """One row of the Wiring Zones table"""
+    description: str
+    combiner_poles: str
+    string_size: str
+    stringing_strategy: str
+
+    def to_dict(self):
+        return {
+            "Description": self.description,
+            "Combiner Poles": self.combiner_poles,
+            "String Size": self.string_size,
+            "Stringing Strategy": self.stringing_strategy
+        }
+
+
+# Row type of each tuple field of HelioscopeExtraction, and a getter of a row's
+# fields as a tuple; to_json stores rows as arrays rather than keyed objects
+_ROW_TYPES = {
+    name: (row_type, attrgetter(*(field.name for field in fields(row_type))))
+    for name, row_type in (("components", ComponentRow), ("system_losses", LossRow), ("wiring_zones", WiringZoneRow))
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HelioscopeExtraction:
+    """Immutable result of parsing one design report (Helioscope, or another tool in report_parsers)"""
+    project_name: Optional[str] = None
+    project_address: Optional[str] = None
+    annual_production: Optional[float] = None
+    performance_ratio: Optional[float] = None
+    weather_dataset: Optional[str] = None
+    components: tuple = ()
+    system_losses: tuple = ()
+    wiring_zones: tuple = ()
+    # Pages whose text was read, out of the pages in the report
+    pages_read: int = 0
+    page_count: int = 0
+    # Design tool that produced the report
+    source_tool: str = "HelioScope"
+
+    def find_component(self, kind):
+        """First component whose name contains kind (case-insensitive)"""
+        return next((c for c in self.components if kind in c.component.lower()), None)
+
+    @property
+    def inverter(self):
+        return self.find_component("inverter")
+
+    @property
+    def strings(self):
+        return self.find_component("string")
+
+    @property
+    def module(self):
+        return self.find_component("module")
+
+    def component_details(self):
+        """Inverter, strings and module rows (None when missing) keyed the way the schedule pages read them"""
+        return {
+            kind: row
+            for kind, row in (("inverter", self.inverter), ("strings", self.strings), ("module", self.module))
+        }
+
+    def to_report_dict(self):
+        """Flat dict shown on the Design Report page and kept as helioscope_data"""
+        data = {"SOURCE TOOL": self.source_tool}
+        if self.project_name is not None: data["PROJECT NAME"] = self.project_name
+        if self.project_address is not None: data["PROJECT ADDRESS"] = self.project_address
+        if self.annual_production is not None: data["ANNUAL PRODUCTION"] = f"{self.annual_production} MWh"
+        if self.performance_ratio is not None: data["PERFORMANCE RATIO"] = f"{self.performance_ratio}%"
+        if self.weather_dataset is not None: data["WEATHER DATASET"] = self.weather_dataset
+        data["SYSTEM LOSSES"] = [loss.to_dict() for loss in self.system_losses]
+        data["COMPONENTS"] = [component.to_dict() for component in self.components]
+        data["WIRING ZONES"] = [zone.to_dict() for zone in self.wiring_zones]
+        return data
+
+    def to_json(self):
+        """Serialize for the persistent extraction cache"""
+        data = {field.name: getattr(self, field.name) for field in fields(self)}
+        for name, (_, row_fields) in _ROW_TYPES.items():
+            data[name] = [row_fields(row) for row in data[name]]
+        return json.dumps(data, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload):
+        """Rebuild an extraction serialized with to_json"""
+        data = json.loads(payload)
+        for name, (row_type, _) in _ROW_TYPES.items():
+            data[name] = tuple(row_type(*row) for row in data[name])
+        return cls(**data)
+
+
+# Text that marks the page holding each section of a Helioscope report
+# (page.search_for is case-insensitive)
+SECTION_MARKERS = {
+    "project": ("Project Name", "Project Address"),
+    "production": ("Annual Production", "Performance Ratio", "Weather Dataset"),
+    "components": ("Components",),
+    "losses": ("Loss", "Degradation"),
+    "wiring_zones": ("Wiring Zones",),
+}
+
+# Sections read as layout tables, named as in helioscope_tables
+TABLE_SECTIONS = ("components", "losses", "wiring_zones")
+
+# Page headings of appendix pages that never hold a section we parse
+APPENDIX_MARKERS = ("Shading", "Appendix", "Field Segment")
+
+# Height in points of the strip at the top of each page read as its fingerprint
+FINGERPRINT_BAND_HEIGHT = 72
+
+# Pages read by check_supported_report, and what their text must hold: the tool's
+# name, or at least PRECHECK_MIN_LABELS of the project page labels
+PRECHECK_PAGES = 2
+PRECHECK_BRAND = "helioscope"
+PRECHECK_LABELS = ("project name", "project address", "annual production", "performance ratio", "weather dataset")
+PRECHECK_MIN_LABELS = 2
+
+# What a report must yield before the early-exit extraction stops reading pages:
+# these fields, a component of each kind, the System Losses table and these
+# layout tables, none of them still running at the bottom of the last page read
+REQUIRED_FIELDS = ("project_name", "project_address", "annual_production", "performance_ratio", "weather_dataset")
+REQUIRED_COMPONENTS = ("inverter", "string", "module")
+REQUIRED_TABLES = ("wiring_zones",)
+
+# Number of pages from which page reads (text, or heading fingerprints) are split
+# across worker processes. Below it, process start-up and result pickling cost
+# more than they save. Measure it on the deployment host with
+# `python bench_extraction.py parallel` before changing the default.
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("HELIOSCOPE_PARALLEL_PAGE_THRESHOLD", 100))
+
+# Worker processes used for parallel page reads
+PARALLEL_WORKERS = int(os.environ.get("HELIOSCOPE_PARALLEL_WORKERS", os.cpu_count() or 1))
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def open_pdf(source):
+    """Open a PDF from its bytes or from a file path"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def read_pdf_text(source):
+    """Join the text of every page of a PDF"""
+    with open_pdf(source) as doc:
+        return "\n".join([page.get_text() for page in doc])
+
+
+def page_text(page):
+    """Plain text of a page"""
+    return page.get_text()
+
+
+def page_fingerprint(page):
+    """Text of the heading strip at the top of a page, much cheaper than the full page"""
+    band = fitz.Rect(page.rect.x0, page.rect.y0, page.rect.x1, page.rect.y0 + FINGERPRINT_BAND_HEIGHT)
+    return page.get_text("text", clip=band).lower()
+
+
+def _read_pages(read, source, page_numbers):
+    # Runs in a worker process, which opens its own copy of the document
+    with open_pdf(source) as doc:
+        return [read(doc[number]) for number in page_numbers]
+
+
+def get_process_pool():
+    """Process pool shared by all parallel page reads, started on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn rather than fork: the Streamlit server is multi-threaded
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def map_pages(read, source, page_numbers, doc=None, parallel=False, threshold=PARALLEL_PAGE_THRESHOLD):
+    """read(page) of each of the given pages, in order; read must be a module-level function.
+
+    With parallel set and at least threshold pages on a multi-core machine,
+    contiguous page ranges are read by the shared process pool, each worker
+    opening the document from source (a path is cheaper to hand over than the
+    bytes). Otherwise the pages are read serially from doc, or from source
+    when no doc is given.
+    """
+    page_numbers = list(page_numbers)
+    if not parallel or source is None or PARALLEL_WORKERS < 2 or len(page_numbers) < threshold:
+        if doc is None:
+            return _read_pages(read, source, page_numbers)
+        return [read(doc[number]) for number in page_numbers]
+
+    pool = get_process_pool()
+    chunk_size = -(-len(page_numbers) // PARALLEL_WORKERS)
+    futures = [
+        pool.submit(_read_pages, read, source, page_numbers[start:start + chunk_size])
+        for start in range(0, len(page_numbers), chunk_size)
+    ]
+    results = []
+    for future in futures:
+        results.extend(future.result())
+    return results
+
+
+def read_page_texts(source, page_numbers, doc=None, parallel=False, threshold=PARALLEL_PAGE_THRESHOLD,
+                    textpages=None):
+    """Text of the given pages in order, from textpages where present and map_pages otherwise"""
+    textpages = textpages or {}
+    page_numbers = list(page_numbers)
+    missing = [number for number in page_numbers if number not in textpages]
+    texts = dict(zip(missing, map_pages(page_text, source, missing, doc, parallel, threshold)))
+    return [textpages[number].extractText() if number in textpages else texts[number] for number in page_numbers]
+
+
+def is_appendix_page(page):
+    """Whether the page heading marks a shading/appendix page and names no section we parse"""
+    return is_appendix_fingerprint(page_fingerprint(page))
+
+
+def is_appendix_fingerprint(fingerprint):
+    """is_appendix_page from the page's fingerprint"""
+    if any(marker.lower() in fingerprint for markers in SECTION_MARKERS.values() for marker in markers):
+        return False
+    return any(marker.lower() in fingerprint for marker in APPENDIX_MARKERS)
+
+
+def check_supported_report(doc):
+    """Raise UnsupportedReportError unless the first pages have a text layer and Helioscope labels.
+
+    Only the first PRECHECK_PAGES pages are read, so scanned and unrelated PDFs
+    are turned away in milliseconds. Returns the TextPages built for those
+    pages, keyed by page number, so extraction does not parse them again.
+    """
+    textpages = {page.number: page.get_textpage() for page in doc.pages(0, min(PRECHECK_PAGES, doc.page_count))}
+    text = " ".join(textpage.extractText() for textpage in textpages.values()).lower()
+    if not text.strip():
+        raise UnsupportedReportError(
+            "The PDF has no text on its first pages, so it looks scanned or image-only. "
+            "Upload the design report PDF exported from Helioscope."
+        )
+    if PRECHECK_BRAND not in text and sum(label in text for label in PRECHECK_LABELS) < PRECHECK_MIN_LABELS:
+        raise UnsupportedReportError(
+            "The PDF does not look like a Helioscope design report: its first pages lack the "
+            "Project Name, Annual Production, Performance Ratio and Weather Dataset labels."
+        )
+    return textpages
+
+
+def iter_report_pages(doc, timer=NULL_TIMER, progress=None, textpages=None, source=None, parallel=False):
+    """Yield (page, textpage) for each non-appendix page, parsing a page only when it is asked for.
+
+    progress, when given, is called with (pages visited, page count) for every
+    page. textpages holds TextPages already built, by page number. With
+    parallel set, a walk still going after PARALLEL_PAGE_THRESHOLD pages has
+    the headings of the remaining pages fingerprinted by map_pages at once.
+    """
+    textpages = textpages or {}
+    fingerprints = {}
+    for page in doc:
+        if progress is not None:
+            progress(page.number + 1, doc.page_count)
+        # Readers that stop early never get here; one that does is reading a long report to its end
+        if parallel and page.number == PARALLEL_PAGE_THRESHOLD:
+            with timer.stage("fingerprint"):
+                remaining = range(page.number, doc.page_count)
+                fingerprints = dict(zip(remaining, map_pages(page_fingerprint, source, remaining, doc, parallel)))
+        with timer.stage("fingerprint"):
+            fingerprint = fingerprints.pop(page.number, None)
+            appendix = is_appendix_fingerprint(fingerprint if fingerprint is not None else page_fingerprint(page))
+        if not appendix:
+            textpage = textpages.get(page.number)
+            if textpage is None:
+                with timer.stage("textpage"):
+                    textpage = page.get_textpage()
+            yield page, textpage
+
+
+def locate_section_pages(doc, source=None, parallel=False):
+    """Map each section of SECTION_MARKERS to the index of the page holding it.
+
+    Page headings are fingerprinted first, with map_pages (so across worker
+    processes when parallel is set and source given); sections not named in
+    any heading are looked up with page.search_for on the remaining
+    non-appendix pages, stopping at the first hit. Sections that cannot be
+    found are left out.
+    """
+    located = {}
+    searchable = []
+    fingerprints = map_pages(page_fingerprint, source, range(doc.page_count), doc, parallel)
+    for number, fingerprint in enumerate(fingerprints):
+        for section, markers in SECTION_MARKERS.items():
+            if section not in located and any(marker.lower() in fingerprint for marker in markers):
+                located[section] = number
+        if not any(marker.lower() in fingerprint for marker in APPENDIX_MARKERS):
+            searchable.append(doc[number])
+
+    for section, markers in SECTION_MARKERS.items():
+        if section in located:
+            continue
+        for page in searchable:
+            if any(page.search_for(marker) for marker in markers):
+                located[section] = page.number
+                break
+    return located
+
+
+def read_report_text(doc, located, textpages=None, source=None, parallel=False):
+    """Join the text of only the pages holding the located report sections.
+
+    Falls back to every page when no section was located, so unusual layouts
+    are still parsed the way they always were. textpages, source and parallel
+    are passed on to read_page_texts.
+    """
+    page_numbers = sorted(set(located.values())) if located else range(doc.page_count)
+    return "\n".join(read_page_texts(source, page_numbers, doc, parallel, textpages=textpages))
+
+
+# Every label the parser cares about, plus percentages for the losses. One finditer
+# over the text visits them in order and the matching group names the handler.
+_ANCHORS = (
+    ("project_name", r"Project Name"),
+    ("project_address", r"Project\s+Address"),
+    ("annual_production", r"Annual\s+Production"),
+    ("performance_ratio", r"Performance\s+Ratio"),
+    ("weather_dataset", r"Weather Dataset"),
+    ("component", r"Inverters|Strings|Module"),
+    ("losses_section", r"System\s+Loss(?:es)?"),
+    ("percent", r"[\d.]+%"),
+)
+
+# Anchors left out of the scan when a layout table already holds the rows they parse
+_TABLE_ANCHORS = {
+    "components": ("component",),
+    "losses": ("losses_section", "percent"),
+}
+
+
+@lru_cache(maxsize=None)
+def _anchor_pattern(skip=frozenset()):
+    # Alternation of every anchor but those in skip
+    return re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _ANCHORS if name not in skip))
+
+
+def skipped_anchors(tables):
+    """Anchors the text scan can leave out given the names of the layout tables already read"""
+    return frozenset(anchor for table in tables for anchor in _TABLE_ANCHORS.get(table, ()))
+
+# Value patterns, matched only at the position of their anchor
+_FIELD_PATTERNS = {
+    "project_name": re.compile(r"Project Name\s+(.*)"),
+    "project_address": re.compile(r"Project\s+Address\s+(.*?)\s+USA", re.DOTALL),
+    "annual_production": re.compile(r"Annual\s+Production\s+([\d.]+)\s+MWh"),
+    "performance_ratio": re.compile(r"Performance\s+Ratio\s+([\d.]+)%"),
+    "weather_dataset": re.compile(r"Weather Dataset\s+(.+?)\s+Simulator Version", re.DOTALL),
+}
+_FIELD_CLEANERS = {
+    "project_name": str.strip,
+    "project_address": lambda value: value.replace('\n', ', ').strip(),
+    "weather_dataset": lambda value: value.replace("\n", " ").strip(),
+    "annual_production": _parse_number,
+    "performance_ratio": _parse_number,
+}
+_COMPONENT_PATTERN = re.compile(
+    r"(Inverters|Strings[^\n]*?|Module)\s+([A-Za-z0-9\-/,().\s]+?)\s+(\d+)\s+\(([\d.,]+)\s*(kW|ft)\)"
+)
+
+
+def _is_loss_label_char(char):
+    # Same character class as [A-Za-z\s]
+    return char.isspace() or ("A" <= char <= "Z") or ("a" <= char <= "z")
+
+
+# Consecutive lines that are not loss rows after which the losses table is over
+LOSSES_MAX_GAP = 3
+
+# Punctuation allowed in loss names besides letters and spaces, e.g. "AC System (Derate)"
+_LOSS_NAME_PUNCTUATION = frozenset("&-/():")
+
+
+def _loss_name(line):
+    # The line as a loss name, or None when it holds anything else
+    if not line or not line[0].isalpha():
+        return None
+    for char in line:
+        if not (char.isalpha() or char.isspace() or char in _LOSS_NAME_PUNCTUATION):
+            return None
+    return " ".join(line.rstrip(":").split())
+
+
+def _loss_percent(token):
+    # "3.2%" -> 3.2, anything else -> None
+    number = token[:-1]
+    if not token.endswith("%") or not number or number.count(".") > 1:
+        return None
+    if not number.replace(".", "").isdigit():
+        return None
+    return float(number)
+
+
+def parse_system_losses(text, start=0):
+    """Parse the loss rows of the System Losses table that starts at start.
+
+    Reads line by line with plain string operations, so it runs in time linear
+    in the length of the table whatever the text holds. A row is a loss name
+    and a percentage on one line ("Soiling 2.0%") or on consecutive lines, as
+    PyMuPDF emits table cells. The table ends after LOSSES_MAX_GAP lines in a
+    row that are not part of a loss row. Returns the rows and the offset where
+    parsing stopped.
+    """
+    rows = []
+    pending_name = None
+    gap = 0
+    position = start
+    length = len(text)
+    while position < length and gap <= LOSSES_MAX_GAP:
+        line_end = text.find("\n", position)
+        if line_end == -1:
+            line_end = length
+        line = text[position:line_end].strip()
+        position = line_end + 1
+        if not line:
+            continue
+
+        name, _, last_token = line.rpartition(" ")
+        percent = _loss_percent(last_token)
+        if percent is not None:
+            name = _loss_name(name.strip()) if name else pending_name
+            if name:
+                rows.append(LossRow(name, percent))
+                pending_name = None
+                gap = 0
+                continue
+
+        # A name on its own line waits for its percentage on the next one
+        pending_name = _loss_name(line)
+        gap += 1
+    return tuple(rows), min(position, length)
+
+
+# Timing stage of each anchor handler, when the scanner is given a timer
+_HANDLER_STAGES = {
+    "component": "scan.components",
+    "losses_section": "scan.losses",
+    "percent": "scan.percents",
+}
+
+
+class HelioscopeTextScanner:
+    """Collects every Helioscope field in a single walk over the report text"""
+
+    def __init__(self, timer=NULL_TIMER, skip=frozenset()):
+        self.timer = timer
+        # Anchors not scanned for (see skipped_anchors)
+        self.skip = skip
+        self.fields = {}
+        self.components = []
+        self.system_losses = []
+        # Rows of the System Losses table; when present they replace the loose
+        # percentages collected from the rest of the text
+        self.section_losses = None
+        # End of the last component / loss match; later matches may not overlap them
+        self._component_end = 0
+        self._loss_end = 0
+        self._handlers = {
+            "component": self._on_component,
+            "losses_section": self._on_losses_section,
+            "percent": self._on_percent,
+        }
+
+    def scan(self, text):
+        """Walk the text once, dispatching each anchor to its handler"""
+        if self.timer is not NULL_TIMER:
+            return self._scan_timed(text)
+        for anchor in _anchor_pattern(self.skip).finditer(text):
+            handler = self._handlers.get(anchor.lastgroup, self._on_field)
+            handler(text, anchor)
+        return self
+
+    def _scan_timed(self, text):
+        # scan() with each handler timed under its stage; kept separate so the
+        # untimed walk pays nothing for it
+        for anchor in _anchor_pattern(self.skip).finditer(text):
+            handler = self._handlers.get(anchor.lastgroup, self._on_field)
+            with self.timer.stage(_HANDLER_STAGES.get(anchor.lastgroup, "scan.fields")):
+                handler(text, anchor)
+        return self
+
+    def feed(self, text):
+        """Scan the text of one more page; match offsets restart with each page"""
+        self._component_end = 0
+        self._loss_end = 0
+        return self.scan(text)
+
+    def complete(self, tables=frozenset()):
+        """Whether every required field, component and the losses table have been found.
+
+        tables names the layout tables already read; components and losses
+        among them count as found whatever the text held.
+        """
+        return (
+            ("losses" in tables or self.section_losses is not None)
+            and all(name in self.fields for name in REQUIRED_FIELDS)
+            and ("components" in tables or all(
+                any(kind in component.component.lower() for component in self.components)
+                for kind in REQUIRED_COMPONENTS
+            ))
+        )
+
+    def _on_field(self, text, anchor):
+        name = anchor.lastgroup
+        if name in self.fields:
+            return
+        match = _FIELD_PATTERNS[name].match(text, anchor.start())
+        if match:
+            value = _FIELD_CLEANERS.get(name, lambda value: value)(match.group(1))
+            # A number that does not parse ("1.2.3") counts as not found
+            if value is not None:
+                self.fields[name] = value
+
+    def _on_component(self, text, anchor):
+        if anchor.start() < self._component_end:
+            return
+        match = _COMPONENT_PATTERN.match(text, anchor.start())
+        if match:
+            self._component_end = match.end()
+            row = ComponentRow.parse(*match.groups())
+            if row:
+                self.components.append(row)
+
+    def _on_losses_section(self, text, anchor):
+        if self.section_losses is not None:
+            return
+        rows, end = parse_system_losses(text, anchor.end())
+        if rows:
+            self.section_losses = rows
+            self._loss_end = end
+
+    def _on_percent(self, text, anchor):
+        # Fallback for reports without a System Losses table: the label is the
+        # run of letters and whitespace directly before the number
+        start = anchor.start()
+        if start < self._loss_end and self.section_losses is not None:
+            return
+        label_start = start
+        while label_start > self._loss_end and _is_loss_label_char(text[label_start - 1]):
+            label_start -= 1
+        label = text[label_start:start]
+        if len(label) < 2 or not label[-1].isspace():
+            return
+        self._loss_end = anchor.end()
+        loss_type = label.strip()
+        percent = _loss_percent(anchor.group())
+        if percent is not None and ("loss" in loss_type.lower() or "degradation" in loss_type.lower()):
+            self.system_losses.append(LossRow(loss_type, percent))
+
+    def result(self):
+        system_losses = self.section_losses if self.section_losses is not None else tuple(self.system_losses)
+        return HelioscopeExtraction(
+            components=tuple(self.components),
+            system_losses=system_losses,
+            **self.fields
+        )
+
+
+def parse_helioscope_text(text, timer=NULL_TIMER, skip=frozenset()):
+    """Parse the text of a Helioscope report into a HelioscopeExtraction, leaving out the anchors in skip"""
+    with timer.stage("scan"):
+        return HelioscopeTextScanner(timer, skip).scan(text).result()
+
+
+def apply_layout_tables(extraction, tables):
+    """Replace the text-parsed components and losses with those read from table layout"""
+    changes = {}
+    if "components" in tables:
+        components = tuple(filter(None, (ComponentRow.parse(*row) for row in component_rows(tables["components"]))))
+        if components:
+            changes["components"] = components
+    if "losses" in tables:
+        losses = ((loss_type, _loss_percent(loss)) for loss_type, loss in tables["losses"].itertuples(index=False))
+        changes["system_losses"] = tuple(
+            LossRow(loss_type, percent) for loss_type, percent in losses if percent is not None
+        )
+    if "wiring_zones" in tables:
+        changes["wiring_zones"] = tuple(WiringZoneRow(*row) for row in tables["wiring_zones"].itertuples(index=False))
+    return replace(extraction, **changes)
+
+
+def project_summary(extraction):
+    """One flat row of the key project figures, for batch exports and comparisons"""
+    inverter, strings, module = extraction.inverter, extraction.strings, extraction.module
+    return {
+        "PROJECT NAME": extraction.project_name,
+        "PROJECT ADDRESS": extraction.project_address,
+        "DC SYSTEM SIZE (kW)": module.value if module else None,
+        "AC SYSTEM SIZE (kW)": inverter.value if inverter else None,
+        "INVERTER (PRODUCT NAME)": inverter.description if inverter else None,
+        "NO OF INVERTERS": inverter.count if inverter else None,
+        "SOLAR PV MODULE (PRODUCT NAME)": module.description if module else None,
+        "NO OF SOLAR PV MODULES": module.count if module else None,
+        "NO OF STRINGS": strings.count if strings else None,
+        "ANNUAL PRODUCTION (MWh)": extraction.annual_production,
+        "PERFORMANCE RATIO (%)": extraction.performance_ratio,
+        "WEATHER DATASET": extraction.weather_dataset,
+        "SOURCE TOOL": extraction.source_tool,
+    }
+
+
+def _extract_incremental(doc, source, parallel, timer, progress, checked_textpages):
+    # Feed pages to the layout tables and the scanner until both are complete;
+    # the scan leaves out the anchors of the tables the layout has already read
+    scanner = HelioscopeTextScanner(timer)
+    layout = LayoutTables()
+    pages_read = 0
+    for page, textpage in iter_report_pages(doc, timer, progress, checked_textpages, source, parallel):
+        pages_read += 1
+        with timer.stage("layout_tables"):
+            layout.add_page(page, textpage)
+        scanner.skip = skipped_anchors(layout.found)
+        with timer.stage("get_text"):
+            text = textpage.extractText()
+        with timer.stage("scan"):
+            scanner.feed(text)
+        # A table reaching the bottom of this page may go on at the top of the next
+        tables = layout.found
+        if scanner.complete(tables) and all(name in tables for name in REQUIRED_TABLES) and not layout.running:
+            break
+    return apply_layout_tables(scanner.result(), layout.tables()), pages_read
+
+
+def read_layout_tables(doc, page_numbers, timer=NULL_TIMER):
+    """LayoutTables read from the given pages and the TextPages built for them.
+
+    A table still running at the bottom of a page is followed onto the next
+    page, whether or not that page was asked for.
+    """
+    layout = LayoutTables()
+    textpages = {}
+    pending = sorted(page_numbers)
+    while pending:
+        number = pending.pop(0)
+        page = doc[number]
+        with timer.stage("textpage"):
+            textpages[number] = page.get_textpage()
+        with timer.stage("layout_tables"):
+            layout.add_page(page, textpages[number])
+        if layout.running and number + 1 < doc.page_count and pending[:1] != [number + 1]:
+            pending.insert(0, number + 1)
+    return layout, textpages
+
+
+def _extract_located(doc, source, parallel, timer):
+    with timer.stage("locate"):
+        located = locate_section_pages(doc, source, parallel)
+    # The tables are read from word positions on the pages holding them; their
+    # TextPages are shared with the plain text extraction
+    layout, textpages = read_layout_tables(doc, {located[s] for s in TABLE_SECTIONS if s in located}, timer)
+    # Sections read as layout tables need no text; the rest are scanned without
+    # the anchors of the tables that were found
+    text_located = {section: number for section, number in located.items() if section not in layout.found}
+    with timer.stage("get_text"):
+        text = read_report_text(doc, text_located, textpages, source, parallel) if text_located or not located else ""
+    pages_read = len(set(text_located.values()) | set(textpages)) if located else doc.page_count
+    extraction = parse_helioscope_text(text, timer, skipped_anchors(layout.found))
+    return apply_layout_tables(extraction, layout.tables()), pages_read
+
+
+# Fields compared by diff_extractions, besides the inverter, strings and module rows
+DIFF_FIELDS = (
+    "project_name", "project_address", "annual_production", "performance_ratio",
+    "weather_dataset", "system_losses", "wiring_zones",
+)
+
+
+def project_key(extraction):
+    """Project name and address, case and spacing normalized, identifying a project across report revisions.
+
+    None when the report names neither, so unnamed reports are never taken
+    for revisions of one another.
+    """
+    key = tuple(
+        " ".join((value or "").lower().split()) for value in (extraction.project_name, extraction.project_address)
+    )
+    return key if any(key) else None
+
+
+def diff_extractions(old, new):
+    """Names of the fields and components ("inverter", "strings", "module") that differ between two extractions"""
+    changed = {name for name in DIFF_FIELDS if getattr(old, name) != getattr(new, name)}
+    changed.update(kind for kind in ("inverter", "strings", "module") if getattr(old, kind) != getattr(new, kind))
+    return frozenset(changed)
+
+
+def extract_helioscope(source, parallel=False, early_exit=True, timer=NULL_TIMER, progress=None, precheck=True):
+    """Extract a HelioscopeExtraction from the bytes or path of a Helioscope PDF.
+
+    By default pages are read one at a time, skipping appendix pages by their
+    heading, and reading stops as soon as every required field has been found,
+    which in a Helioscope report is within the first few pages. With early_exit
+    off, the section pages are located across the whole document first and
+    read together. parallel lets reads of at least PARALLEL_PAGE_THRESHOLD
+    pages go to worker processes: locating, the all-pages fallback and an
+    early-exit walk that runs that far (see map_pages).
+
+    Pass a stage_timing.StageTimer as timer to see where the time goes, and a
+    progress callback to be told (pages visited, page count) as pages are read
+    (early-exit reading only). Unless precheck is off, scanned and
+    non-Helioscope PDFs raise UnsupportedReportError before any extraction work.
+    """
+    with timer.stage("open"):
+        doc = open_pdf(source)
+    with doc:
+        checked_textpages = {}
+        if precheck:
+            with timer.stage("precheck"):
+                checked_textpages = check_supported_report(doc)
+        if early_exit:
+            extraction, pages_read = _extract_incremental(doc, source, parallel, timer, progress, checked_textpages)
+        else:
+            extraction, pages_read = _extract_located(doc, source, parallel, timer)
+        return replace(extraction, pages_read=pages_read, page_count=doc.page_count)
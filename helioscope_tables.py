@@ -0,0 +1,245 @@
+"""Layout-aware extraction of the tables in a Helioscope report, from word positions"""
+import re
+
+import pandas as pd
+
+# Words whose vertical centres are this close (points) sit on the same visual line
+LINE_TOLERANCE = 2.0
+
+# Visual lines closer than this (points) belong to the same table row, i.e. a
+# cell wrapped onto another line. Table rows are separated by cell padding.
+WRAP_GAP = 2.0
+
+# A vertical gap larger than this (points) ends a table
+MAX_ROW_GAP = 30.0
+
+# A table whose last row ends within this distance (points) of the bottom of its
+# page may run on at the top of the next page
+TABLE_CONTINUATION_MARGIN = 100.0
+
+# Header labels of each table, left to right, and the column every row must fill
+TABLE_HEADERS = {
+    "components": (("Component", "Name", "Count"), "Count"),
+    "wiring_zones": (("Description", "Combiner Poles", "String Size", "Stringing Strategy"), "String Size"),
+}
+
+# Tables without a header row: heading text and their column names
+HEADING_TABLES = {
+    "losses": ("System Losses", ("Loss Type", "Loss (%)")),
+}
+
+_COUNT_PATTERN = re.compile(r"(\d+)\s+\(([\d.,]+)\s*(kW|ft)\)")
+
+
+class _Line:
+    """Words of one visual line, left to right"""
+    __slots__ = ("top", "bottom", "words")
+
+    def __init__(self, word):
+        self.top = word[1]
+        self.bottom = word[3]
+        self.words = [word]
+
+    def add(self, word):
+        self.top = min(self.top, word[1])
+        self.bottom = max(self.bottom, word[3])
+        self.words.append(word)
+
+    @property
+    def text(self):
+        return " ".join(word[4] for word in self.words)
+
+
+def page_lines(page, textpage=None):
+    """Visual lines of a page from page.get_text("words"), top to bottom"""
+    words = textpage.extractWORDS() if textpage is not None else page.get_text("words")
+    words = sorted(words, key=lambda word: ((word[1] + word[3]) / 2, word[0]))
+    lines = []
+    for word in words:
+        middle = (word[1] + word[3]) / 2
+        if lines and abs(middle - (lines[-1].top + lines[-1].bottom) / 2) <= LINE_TOLERANCE:
+            lines[-1].add(word)
+        else:
+            lines.append(_Line(word))
+    for line in lines:
+        line.words.sort(key=lambda word: word[0])
+    return lines
+
+
+def _find_header(lines, labels):
+    # Index of the line holding every label in order and the x where each column starts
+    for index, line in enumerate(lines):
+        texts = [word[4] for word in line.words]
+        starts = []
+        position = 0
+        for label in labels:
+            parts = label.split()
+            while position + len(parts) <= len(texts) and texts[position:position + len(parts)] != parts:
+                position += 1
+            if position + len(parts) > len(texts):
+                break
+            starts.append(line.words[position][0])
+            position += len(parts)
+        if len(starts) == len(labels):
+            return index, starts
+    return None, None
+
+
+def _group_rows(lines):
+    # Merge visual lines of wrapped cells into table rows, stopping at a large gap
+    rows = []
+    for line in lines:
+        if rows:
+            gap = line.top - rows[-1][-1].bottom
+            if gap > MAX_ROW_GAP:
+                break
+            if gap < WRAP_GAP:
+                rows[-1].append(line)
+                continue
+        rows.append([line])
+    return rows
+
+
+def _cells(row, starts):
+    # Text of each column of a row; a word belongs to the last column starting left of it
+    cells = [[] for _ in starts]
+    for line in row:
+        for word in line.words:
+            column = 0
+            for index, start in enumerate(starts):
+                if word[0] >= start - LINE_TOLERANCE:
+                    column = index
+            cells[column].append(word[4])
+    return [" ".join(cell) for cell in cells]
+
+
+def _header_rows(lines, labels, key_label, starts=None):
+    # Rows under the header, the column starts and the bottom of the table; given
+    # the column starts of a table running on from the previous page, rows are
+    # read from the top of the page unless the header is repeated
+    header_index, header_starts = _find_header(lines, labels)
+    if header_index is not None:
+        starts = header_starts
+        bottom = lines[header_index].bottom
+        lines = lines[header_index + 1:]
+    elif starts is not None:
+        bottom = None
+    else:
+        return None
+    required_column = labels.index(key_label)
+    records = []
+    for row in _group_rows(lines):
+        cells = _cells(row, starts)
+        # A row without its key column is the start of whatever follows the table
+        if not cells[0] or not cells[required_column]:
+            break
+        records.append(cells)
+        bottom = row[-1].bottom
+    return records, starts, bottom
+
+
+def _heading_rows(lines, heading, continued=False):
+    # Rows under the heading and the bottom of the table; a table running on from
+    # the previous page is read from the top of the page
+    heading_index = next((index for index, line in enumerate(lines) if line.text == heading), None)
+    if heading_index is not None:
+        bottom = lines[heading_index].bottom
+        lines = lines[heading_index + 1:]
+    elif continued:
+        bottom = None
+    else:
+        return None
+    records = []
+    for row in _group_rows(lines):
+        words = [word[4] for line in row for word in line.words]
+        if len(words) < 2 or not words[-1].endswith("%"):
+            break
+        records.append([" ".join(words[:-1]), words[-1]])
+        bottom = row[-1].bottom
+    return records, None, bottom
+
+
+class LayoutTables:
+    """Components, Wiring Zones and Losses tables read from word positions, one page at a time.
+
+    Words are clustered into visual lines by their vertical position, lines into
+    rows by the gaps between them (so wrapped descriptions stay in their row)
+    and words into columns by the x position of the header labels. A table whose
+    last row reaches the bottom margin of its page is left running: when the
+    next page is added, its rows continue from the top of that page, with or
+    without a repeated header.
+    """
+
+    def __init__(self):
+        self._records = {}
+        # Tables running past the bottom of the last page added, with their column starts
+        self._running = {}
+        self._last_page = None
+
+    def add_page(self, page, textpage=None):
+        """Read the tables on one more page, passing the TextPage already built for it if there is one"""
+        lines = page_lines(page, textpage)
+        margin = page.rect.y1 - TABLE_CONTINUATION_MARGIN
+        # A table only runs on onto the page directly after the one it was left running on
+        running = self._running if self._last_page == page.number - 1 else {}
+        self._running = {}
+        self._last_page = page.number
+        # Only the first table of each kind is kept
+        found = self.found
+        for name, (labels, key_label) in TABLE_HEADERS.items():
+            if name not in found or name in running:
+                self._add(name, _header_rows(lines, labels, key_label, running.get(name)), margin)
+        for name, (heading, _) in HEADING_TABLES.items():
+            if name not in found or name in running:
+                self._add(name, _heading_rows(lines, heading, name in running), margin)
+
+    def _add(self, name, rows, margin):
+        if rows is None:
+            return
+        records, starts, bottom = rows
+        self._records.setdefault(name, []).extend(records)
+        if bottom is not None and bottom >= margin:
+            self._running[name] = starts
+
+    @property
+    def found(self):
+        """Names of the tables with at least one row so far"""
+        return frozenset(name for name, records in self._records.items() if records)
+
+    @property
+    def running(self):
+        """Whether a table reached the bottom of the last page added, so may continue on the next"""
+        return bool(self._running)
+
+    def tables(self):
+        """The tables found so far as DataFrames, by name"""
+        columns = {name: labels for name, (labels, _) in TABLE_HEADERS.items()}
+        columns.update((name, table_columns) for name, (_, table_columns) in HEADING_TABLES.items())
+        return {
+            name: pd.DataFrame(records, columns=list(columns[name]))
+            for name, records in self._records.items() if records
+        }
+
+
+def extract_layout_tables(pages, textpages=None):
+    """Components, Wiring Zones and Losses tables found on pages, as DataFrames.
+
+    See LayoutTables; tables that are not found are left out of the result.
+    textpages maps page numbers to TextPages already built for them, so the
+    page is not parsed twice.
+    """
+    textpages = textpages or {}
+    layout = LayoutTables()
+    for page in pages:
+        layout.add_page(page, textpages.get(page.number))
+    return layout.tables()
+
+
+def component_rows(table):
+    """(Component, Description, Count, Value, Unit) tuples from a Components table"""
+    rows = []
+    for component, name, count in table.itertuples(index=False):
+        match = _COUNT_PATTERN.fullmatch(count)
+        if match:
+            rows.append((component, name, *match.groups()))
+    return rows
@@ -0,0 +1,83 @@
+"""Portfolio table of cached extractions, for comparing projects side by side"""
+import numpy as np
+import pandas as pd
+
+from helioscope_extractor import HelioscopeExtraction, project_summary
+
+# Columns of project_summary, in order
+SUMMARY_COLUMNS = list(project_summary(HelioscopeExtraction()))
+
+NUMERIC_COLUMNS = [
+    "DC SYSTEM SIZE (kW)", "AC SYSTEM SIZE (kW)", "NO OF INVERTERS", "NO OF SOLAR PV MODULES",
+    "NO OF STRINGS", "ANNUAL PRODUCTION (MWh)", "PERFORMANCE RATIO (%)",
+]
+
+
+def _normalized(column):
+    # Lower-cased, single-spaced text of a column, for matching projects across revisions
+    return column.fillna("").str.lower().str.split().str.join(" ")
+
+
+def portfolio_frame(entries):
+    """One row per cached (key, extraction) pair with the project summary and derived ratios.
+
+    Numeric columns are floats (NaN where a report lacked the value), so
+    filters, sorting and aggregates all run column-wise.
+    """
+    frame = pd.DataFrame.from_records(
+        [project_summary(extraction) for _, extraction in entries], columns=SUMMARY_COLUMNS
+    )
+    frame.insert(0, "KEY", [key for key, _ in entries])
+    frame[NUMERIC_COLUMNS] = frame[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["DC/AC RATIO"] = frame["DC SYSTEM SIZE (kW)"] / frame["AC SYSTEM SIZE (kW)"]
+        frame["SPECIFIC YIELD (kWh/kWp)"] = frame["ANNUAL PRODUCTION (MWh)"] * 1000 / frame["DC SYSTEM SIZE (kW)"]
+    return frame.replace([np.inf, -np.inf], np.nan)
+
+
+def latest_revisions(frame):
+    """Keep the first row of each project (name and address), i.e. the most recently used revision"""
+    projects = pd.DataFrame({
+        "name": _normalized(frame["PROJECT NAME"]),
+        "address": _normalized(frame["PROJECT ADDRESS"]),
+    })
+    # Reports naming neither are separate projects (see project_key), so all of them are kept
+    unnamed = (projects["name"] == "") & (projects["address"] == "")
+    return frame[~projects.duplicated() | unnamed]
+
+
+def filter_portfolio(frame, search="", inverters=(), dc_range=None, pr_range=None):
+    """Rows matching a name/address search, any of the inverters and the DC size and PR ranges"""
+    mask = pd.Series(True, index=frame.index)
+    if search:
+        needle = search.lower()
+        mask &= (
+            frame["PROJECT NAME"].fillna("").str.lower().str.contains(needle, regex=False)
+            | frame["PROJECT ADDRESS"].fillna("").str.lower().str.contains(needle, regex=False)
+        )
+    if inverters:
+        mask &= frame["INVERTER (PRODUCT NAME)"].isin(inverters)
+    if dc_range:
+        mask &= frame["DC SYSTEM SIZE (kW)"].between(*dc_range)
+    if pr_range:
+        mask &= frame["PERFORMANCE RATIO (%)"].between(*pr_range)
+    return frame[mask]
+
+
+def portfolio_totals(frame):
+    """Headline figures of a portfolio frame"""
+    production = frame["ANNUAL PRODUCTION (MWh)"]
+    ratio = frame["PERFORMANCE RATIO (%)"]
+    weighted = production.notna() & ratio.notna()
+    return {
+        "projects": len(frame),
+        "dc_mw": frame["DC SYSTEM SIZE (kW)"].sum() / 1000,
+        "ac_mw": frame["AC SYSTEM SIZE (kW)"].sum() / 1000,
+        "inverters": int(frame["NO OF INVERTERS"].sum()),
+        "production_gwh": production.sum() / 1000,
+        # Production-weighted, so large projects count for more than small ones
+        "performance_ratio": (
+            (ratio[weighted] * production[weighted]).sum() / production[weighted].sum()
+            if production[weighted].sum() else float("nan")
+        ),
+    }
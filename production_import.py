@@ -0,0 +1,133 @@
+"""Import of Helioscope hourly (8760) production CSV exports: monthly energy, peak AC output and clipping"""
+import calendar
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Rows read per chunk; an 8760 file is read in a handful of chunks
+CHUNK_ROWS = 2000
+
+# Accepted header names of each column, most specific first (compared lower-cased and stripped)
+COLUMN_CANDIDATES = {
+    "ac_power": ("grid_power", "ac_power", "ac power (w)", "ac power (kw)", "ac power", "ac_output"),
+    "clipping": ("inverter_overpower_loss", "inverter overpower loss", "clipping_loss", "clipping loss", "clipping"),
+    "month": ("month",),
+    "timestamp": ("timestamp", "datetime", "date", "time"),
+}
+
+# Without a clipping column, hours at or above this fraction of the inverter AC
+# capacity count as clipped
+CLIPPING_CAPACITY_FRACTION = 0.995
+
+HOURS_PER_YEAR = 8760
+
+# Hour of the year at which each month starts, for files with neither a month
+# nor a timestamp column (hour rows of a non-leap year)
+_MONTH_START_HOURS = np.cumsum([0] + [calendar.monthrange(2023, month)[1] * 24 for month in range(1, 12)])
+
+
+@dataclass(frozen=True)
+class ProductionSummary:
+    """Totals of one hourly production file; energy in MWh, power in kW"""
+    monthly_mwh: tuple
+    peak_ac_kw: float
+    peak_hour: int
+    clipping_hours: int
+    hours: int
+
+    @property
+    def annual_mwh(self):
+        return sum(self.monthly_mwh)
+
+    def monthly_frame(self):
+        """One row per month (number and name), for tables and charts"""
+        return pd.DataFrame({
+            "Month": range(1, 13),
+            "Name": list(calendar.month_abbr[1:]),
+            "Energy (MWh)": self.monthly_mwh,
+        })
+
+
+def _normalized(name):
+    return str(name).strip().lower()
+
+
+def _resolve_columns(header):
+    # Map each role of COLUMN_CANDIDATES to the first matching header name
+    names = {_normalized(name): name for name in header}
+    columns = {}
+    for role, candidates in COLUMN_CANDIDATES.items():
+        match = next((names[candidate] for candidate in candidates if candidate in names), None)
+        if match is not None:
+            columns[role] = match
+    return columns
+
+
+def _power_scale(column):
+    # Factor to kW: Helioscope exports power in W unless the header says otherwise
+    name = _normalized(column)
+    if "mw" in name:
+        return 1000.0
+    if "kw" in name:
+        return 1.0
+    return 0.001
+
+
+def import_hourly_production(file, ac_capacity_kw=None, chunksize=CHUNK_ROWS):
+    """Summarize an hourly production CSV (path or file-like), reading it chunk by chunk.
+
+    Each row is one hour. Months come from a month column, else a timestamp
+    column, else the row's position in the year. Clipped hours are those with a
+    positive clipping loss, or, in files without that column, those at
+    CLIPPING_CAPACITY_FRACTION of ac_capacity_kw (the extracted inverter
+    capacity). Raises ValueError when no AC power column is found.
+    """
+    header = pd.read_csv(file, nrows=0).columns
+    if hasattr(file, "seek"):
+        file.seek(0)
+    columns = _resolve_columns(header)
+    if "ac_power" not in columns:
+        raise ValueError(
+            "No AC power column found in the CSV; expected one of: " + ", ".join(COLUMN_CANDIDATES["ac_power"])
+        )
+    ac_scale = _power_scale(columns["ac_power"])
+
+    monthly_kwh = np.zeros(12)
+    peak_ac_kw = 0.0
+    peak_hour = 0
+    clipping_hours = 0
+    hours = 0
+    for chunk in pd.read_csv(file, usecols=list(columns.values()), chunksize=chunksize):
+        ac_kw = pd.to_numeric(chunk[columns["ac_power"]], errors="coerce").fillna(0.0).to_numpy() * ac_scale
+
+        if "month" in columns:
+            months = pd.to_numeric(chunk[columns["month"]], errors="coerce").fillna(1).to_numpy(dtype=int)
+        elif "timestamp" in columns:
+            months = pd.to_datetime(chunk[columns["timestamp"]], errors="coerce").dt.month.fillna(1).to_numpy(dtype=int)
+        else:
+            row_hours = np.arange(hours, hours + len(chunk)) % HOURS_PER_YEAR
+            months = np.searchsorted(_MONTH_START_HOURS, row_hours, side="right")
+        # Each row is one hour, so its kW is also its kWh
+        monthly_kwh += np.bincount(np.clip(months, 1, 12) - 1, weights=ac_kw, minlength=12)
+
+        if len(ac_kw):
+            index = int(ac_kw.argmax())
+            if ac_kw[index] > peak_ac_kw:
+                peak_ac_kw = float(ac_kw[index])
+                peak_hour = hours + index
+
+        if "clipping" in columns:
+            clipping = pd.to_numeric(chunk[columns["clipping"]], errors="coerce").fillna(0.0).to_numpy()
+            clipping_hours += int(np.count_nonzero(clipping > 0))
+        elif ac_capacity_kw:
+            clipping_hours += int(np.count_nonzero(ac_kw >= ac_capacity_kw * CLIPPING_CAPACITY_FRACTION))
+        hours += len(chunk)
+
+    return ProductionSummary(
+        monthly_mwh=tuple(float(value) for value in monthly_kwh / 1000),
+        peak_ac_kw=peak_ac_kw,
+        peak_hour=peak_hour,
+        clipping_hours=clipping_hours,
+        hours=hours,
+    )
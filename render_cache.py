@@ -0,0 +1,38 @@
+"""Cache keys of rendered schedule PDFs: a stable hash of the section and its normalized inputs"""
+import hashlib
+import json
+
+import pandas as pd
+
+# Bump when a renderer's output changes, so PDFs rendered by the old code are not served
+RENDERER_VERSION = "1"
+
+
+def normalize_inputs(value):
+    """JSON-able form of renderer inputs that changes exactly when the rendered PDF can.
+
+    Renderers print every value with str(), so values are compared as strings
+    (an int 18 and a numpy 18 render the same), except None, which some
+    renderers leave blank. Dicts keep their order, which is the row order.
+    DataFrames keep their column labels and whether those are a MultiIndex,
+    which changes the header rows.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {
+            "multi_index": isinstance(value.columns, pd.MultiIndex),
+            "columns": [normalize_inputs(column) for column in value.columns],
+            "values": [[normalize_inputs(cell) for cell in row] for row in value.values.tolist()],
+        }
+    if isinstance(value, dict):
+        return [[normalize_inputs(key), normalize_inputs(item)] for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(item) for item in value]
+    if value is None:
+        return None
+    return str(value)
+
+
+def render_key(section, inputs, renderer_version=RENDERER_VERSION):
+    """Cache key of a section rendered from inputs, stable across sessions and restarts"""
+    payload = json.dumps([section, normalize_inputs(inputs)], separators=(",", ":"))
+    return f"{renderer_version}:{section}:{hashlib.sha256(payload.encode()).hexdigest()}"
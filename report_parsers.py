@@ -0,0 +1,314 @@
+r"""Registry of design report parsers, picked by a fingerprint of the report's first page.
+
+Every parser returns a HelioscopeExtraction, so reports from any tool feed the
+same System Schedule pages, cache and portfolio. To support another tool,
+register a function taking (source, timer, progress, parallel) with the report header
+or title the tool prints at the start of a line of its first page:
+
+    @register_parser("mytool", "MyTool", r"MyTool\s+Report")
+    def extract_mytool(source, timer=NULL_TIMER, progress=None, parallel=False):
+        ...
+
+and bump EXTRACTOR_VERSION whenever a parser's output changes.
+"""
+import re
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from helioscope_extractor import (
+    ComponentRow,
+    HelioscopeExtraction,
+    LossRow,
+    PARALLEL_PAGE_THRESHOLD,
+    UnsupportedReportError,
+    check_supported_report,
+    extract_helioscope,
+    open_pdf,
+    read_page_texts,
+)
+from stage_timing import NULL_TIMER
+
+
+@dataclass(frozen=True)
+class ReportParser:
+    """A report format: its design tool, first-page fingerprint (a regex) and extract function"""
+    name: str
+    tool: str
+    fingerprint: str
+    extract: Callable
+
+
+# Registered parsers by name, in registration order
+PARSERS = {}
+
+# Alternation of every fingerprint as a named group, rebuilt on registration, so
+# a first page is identified with one regex search however many parsers exist.
+# Fingerprints only match at the start of a line, where headers and titles are
+# printed, so a tool named in passing ("Imported from Aurora Solar") is ignored.
+_dispatch_pattern = None
+
+
+def register_parser(name, tool, fingerprint):
+    """Decorator registering extract(source, timer, progress, parallel) for reports whose first page matches"""
+    def register(extract):
+        global _dispatch_pattern
+        PARSERS[name] = ReportParser(name, tool, fingerprint, extract)
+        _dispatch_pattern = re.compile(
+            "|".join(f"(?P<{parser.name}>^[ \t]*(?:{parser.fingerprint}))" for parser in PARSERS.values()),
+            re.IGNORECASE | re.MULTILINE
+        )
+        return extract
+    return register
+
+
+def detect_parser(first_page_text):
+    """Parser whose fingerprint starts the first matching line of the text, or None"""
+    match = _dispatch_pattern.search(first_page_text) if _dispatch_pattern else None
+    return PARSERS[match.lastgroup] if match else None
+
+
+def identify_report(doc):
+    """Parser of an open PDF, from the text of its first page.
+
+    Raises UnsupportedReportError for scanned PDFs and for reports no parser
+    recognises. Helioscope reports whose name is only in the logo image are
+    still recognised by their project page labels.
+    """
+    text = doc[0].get_text() if doc.page_count else ""
+    if not text.strip():
+        raise UnsupportedReportError(
+            "The PDF has no text on its first page, so it looks scanned or image-only. "
+            "Upload the design report PDF exported from your design tool."
+        )
+    parser = detect_parser(text)
+    if parser is not None:
+        return parser
+    try:
+        check_supported_report(doc)
+    except UnsupportedReportError:
+        tools = ", ".join(parser.tool for parser in PARSERS.values())
+        raise UnsupportedReportError(
+            f"The PDF does not look like a design report from a supported tool ({tools})."
+        ) from None
+    return PARSERS["helioscope"]
+
+
+def identify_source(source):
+    """identify_report on the PDF at source (bytes or path)"""
+    with open_pdf(source) as doc:
+        return identify_report(doc)
+
+
+def extract_report(source, timer=NULL_TIMER, progress=None, parser=None, parallel=False):
+    """Extract a HelioscopeExtraction from a report of any registered tool.
+
+    parser, when already known (see identify_source), skips identification.
+    parallel lets long reports be read by worker processes (see map_pages).
+    """
+    if parser is None:
+        with timer.stage("identify"):
+            parser = identify_source(source)
+    return parser.extract(source, timer=timer, progress=progress, parallel=parallel)
+
+
+def _read_text(source, timer, progress, parallel=False):
+    # Joined text of every page, and the page count
+    with timer.stage("open"):
+        doc = open_pdf(source)
+    with doc:
+        if parallel and doc.page_count >= PARALLEL_PAGE_THRESHOLD:
+            # Long report: pages go to the process pool in bulk, so progress
+            # is only reported once they are all in
+            with timer.stage("get_text"):
+                texts = read_page_texts(source, range(doc.page_count), doc, parallel)
+            if progress is not None:
+                progress(doc.page_count, doc.page_count)
+            return "\n".join(texts), doc.page_count
+        texts = []
+        for page in doc:
+            if progress is not None:
+                progress(page.number + 1, doc.page_count)
+            with timer.stage("get_text"):
+                texts.append(page.get_text())
+        return "\n".join(texts), doc.page_count
+
+
+def _float(text):
+    # "1,712.4" -> 1712.4; None for text like "1.5." that is not a number
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _number(pattern, text, scales=None):
+    # First group of the first match as a float, multiplied by the scale of the
+    # unit in the second group when scales are given; None when absent
+    match = pattern.search(text)
+    value = _float(match.group(1)) if match else None
+    if value is None:
+        return None
+    return value * scales[match.group(2)] if scales else value
+
+
+def _losses(pattern, text):
+    # LossRows of the (name, percent) matches of pattern, leaving out rows whose percent does not parse
+    rows = ((" ".join(name.split()), _float(percent)) for name, percent in pattern.findall(text))
+    return tuple(LossRow(name, percent) for name, percent in rows if percent is not None)
+
+
+def _string_row(strings):
+    # Strings row of a match of the string count and the modules per string; no
+    # wire lengths in these reports, so the value is the string length in modules
+    count, length = strings.groups()
+    return ComponentRow.parse("Strings", f"{length} modules in series", count, length, "modules")
+
+
+def _text(pattern, text):
+    # First group of the first match, whitespace collapsed; None when absent
+    match = pattern.search(text)
+    return " ".join(match.group(1).split()) if match else None
+
+
+# Report title; reports with the name only in the logo are caught by identify_report
+@register_parser("helioscope", "HelioScope", r"HelioScope\s+Design\s+Report")
+def extract_helioscope_report(source, timer=NULL_TIMER, progress=None, parallel=False):
+    # Identified already, so the Helioscope precheck is not repeated
+    return extract_helioscope(source, parallel=parallel, timer=timer, progress=progress, precheck=False)
+
+
+# PVsyst simulation report (project summary, PV array characteristics and loss pages)
+_PVSYST_PATTERNS = {
+    "project_name": re.compile(r"Project\s*:\s*(.+)"),
+    "project_address": re.compile(r"Geographical Site\s+(.+)"),
+    "weather_dataset": re.compile(r"Meteo data\s*:?\s+(.+)"),
+    "annual_production": re.compile(r"Produced Energy\s+([\d.,]+)\s*(MWh|kWh|GWh)/year"),
+    "performance_ratio": re.compile(r"Perf(?:\.|ormance) Ratio(?: PR)?\s+([\d.,]+)\s*%"),
+    "module_count": re.compile(r"(?:Nb\. of modules|Number of PV modules)\s+([\d,]+)\s*units"),
+    "dc_power": re.compile(r"(?:Pnom total|Nominal \(STC\))\s+([\d.,]+)\s*(kWp|MWp)"),
+    "inverter_count": re.compile(r"(?:Nb\. of (?:units|inverters)|Number of inverters)\s+([\d,]+)\s*units"),
+    "ac_power": re.compile(r"(?:Pnom total|Total power)\s+([\d.,]+)\s*(kWac|MWac)"),
+    "strings": re.compile(r"(\d+)\s*Strings?\s*x\s*(\d+)\s*In series", re.IGNORECASE),
+    # PV module first, then inverter, each as "Manufacturer X" / "Model Y" lines
+    "equipment": re.compile(r"Manufacturer\s+(.+?)\s*\n\s*Model\s+(.+)"),
+    # Loss name, any parameters printed after it on its line, then its loss fraction
+    "loss": re.compile(r"([A-Z][A-Za-z ./]*[Ll]oss(?:es)?)[^\n]*\s+Loss Fraction\s+(-?[\d.]+)\s*%"),
+}
+
+_ENERGY_SCALES = {"kWh": 0.001, "MWh": 1.0, "GWh": 1000.0}
+_POWER_SCALES = {"kWp": 1.0, "MWp": 1000.0, "kWac": 1.0, "MWac": 1000.0}
+
+
+def parse_pvsyst_text(text):
+    """Parse the text of a PVsyst simulation report into a HelioscopeExtraction"""
+    patterns = _PVSYST_PATTERNS
+    equipment = [
+        ", ".join(" ".join(part.split()) for part in match.groups())
+        for match in patterns["equipment"].finditer(text)
+    ]
+    module_name = equipment[0] if equipment else ""
+    inverter_name = equipment[1] if len(equipment) > 1 else ""
+
+    components = []
+    inverter_count = _number(patterns["inverter_count"], text)
+    ac_power = _number(patterns["ac_power"], text, _POWER_SCALES)
+    if inverter_count is not None and ac_power is not None:
+        components.append(ComponentRow("Inverters", inverter_name, int(inverter_count), ac_power, "kW"))
+    strings = patterns["strings"].search(text)
+    if strings:
+        components.append(_string_row(strings))
+    module_count = _number(patterns["module_count"], text)
+    dc_power = _number(patterns["dc_power"], text, _POWER_SCALES)
+    if module_count is not None and dc_power is not None:
+        components.append(ComponentRow("Module", module_name, int(module_count), dc_power, "kW"))
+
+    return HelioscopeExtraction(
+        project_name=_text(patterns["project_name"], text),
+        project_address=_text(patterns["project_address"], text),
+        annual_production=_number(patterns["annual_production"], text, _ENERGY_SCALES),
+        performance_ratio=_number(patterns["performance_ratio"], text),
+        weather_dataset=_text(patterns["weather_dataset"], text),
+        components=tuple(components),
+        system_losses=_losses(patterns["loss"], text),
+        source_tool="PVsyst",
+    )
+
+
+# Page header "PVsyst V7.4.2", or the cover title "PVsyst - Simulation report"
+@register_parser("pvsyst", "PVsyst", r"PVsyst\s+V\d+(?:\.\d+)*|PVsyst\s*-\s*Simulation\s+report")
+def extract_pvsyst_report(source, timer=NULL_TIMER, progress=None, parallel=False):
+    text, page_count = _read_text(source, timer, progress, parallel)
+    with timer.stage("scan"):
+        extraction = parse_pvsyst_text(text)
+    return replace(extraction, pages_read=page_count, page_count=page_count)
+
+
+# Aurora Solar design / performance simulation report
+_AURORA_PATTERNS = {
+    "project_name": re.compile(r"Project Name\s*:?\s+(.+)"),
+    # "Project Address" or "Site Address" heading a line, not e.g. an "Email Address"
+    "project_address": re.compile(r"^[ \t]*(?:Project|Site) Address\s*:?\s+(.+)", re.MULTILINE),
+    "weather_dataset": re.compile(r"Weather (?:Dataset|Data|File|Station)\s*:?\s+(.+)"),
+    "annual_production": re.compile(r"Annual (?:Energy )?Production\s*:?\s+([\d.,]+)\s*(MWh|kWh|GWh)"),
+    "performance_ratio": re.compile(r"Performance Ratio\s*:?\s+([\d.,]+)\s*%"),
+    "dc_power": re.compile(r"(?:DC )?System Size\s*:?\s+([\d.,]+)\s*(kW|MW)\s*(?:\(?DC\)?)"),
+    "ac_power": re.compile(r"(?:AC System Size|AC Size|Inverter Capacity)\s*:?\s+([\d.,]+)\s*(kW|MW)"),
+    # Components table rows: "Modules  REC Alpha 405 (405W)  30 (12.2 kW)"
+    "component": re.compile(
+        r"^\s*(Inverters?|Strings?|Modules?)\s+([^\n]+?)\s+(\d+)(?:\s+\(([\d.,]+)\s*(kW|ft)\))?\s*$", re.MULTILINE
+    ),
+    "strings": re.compile(r"(\d+)\s+strings?\s+of\s+(\d+)\s+modules", re.IGNORECASE),
+    "loss": re.compile(r"^\s*([A-Z][A-Za-z &/()-]*?)\s+(-?[\d.]+)\s*%\s*$", re.MULTILINE),
+}
+
+_SIZE_SCALES = {"kW": 1.0, "MW": 1000.0}
+
+# Component names as the schedule pages expect them
+_AURORA_COMPONENTS = {"inverter": "Inverters", "string": "Strings", "module": "Module"}
+
+
+def parse_aurora_text(text):
+    """Parse the text of an Aurora Solar report into a HelioscopeExtraction"""
+    patterns = _AURORA_PATTERNS
+    sizes = {"inverter": _number(patterns["ac_power"], text, _SIZE_SCALES),
+             "module": _number(patterns["dc_power"], text, _SIZE_SCALES)}
+
+    components = {}
+    for kind, description, count, value, unit in patterns["component"].findall(text):
+        kind = kind.lower().rstrip("s")
+        if kind in components:
+            continue
+        description = " ".join(description.split())
+        if value:
+            row = ComponentRow.parse(_AURORA_COMPONENTS[kind], description, count, value, unit)
+        elif sizes.get(kind) is not None:
+            # Rows without a "(value unit)" take the system size printed on the summary page
+            row = ComponentRow(_AURORA_COMPONENTS[kind], description, int(count), sizes[kind], "kW")
+        else:
+            row = None
+        if row is not None:
+            components[kind] = row
+    strings = patterns["strings"].search(text)
+    if "string" not in components and strings:
+        components["string"] = _string_row(strings)
+
+    loss_section = text[text.find("Losses"):] if "Losses" in text else ""
+    return HelioscopeExtraction(
+        project_name=_text(patterns["project_name"], text),
+        project_address=_text(patterns["project_address"], text),
+        annual_production=_number(patterns["annual_production"], text, _ENERGY_SCALES),
+        performance_ratio=_number(patterns["performance_ratio"], text),
+        weather_dataset=_text(patterns["weather_dataset"], text),
+        components=tuple(components[kind] for kind in _AURORA_COMPONENTS if kind in components),
+        system_losses=_losses(patterns["loss"], loss_section),
+        source_tool="Aurora",
+    )
+
+
+# Report title, e.g. "Aurora Solar  Performance Simulation"
+@register_parser("aurora", "Aurora", r"Aurora\s*Solar\s+(?:Performance\s+Simulation|Design\s+Report)")
+def extract_aurora_report(source, timer=NULL_TIMER, progress=None, parallel=False):
+    text, page_count = _read_text(source, timer, progress, parallel)
+    with timer.stage("scan"):
+        extraction = parse_aurora_text(text)
+    return replace(extraction, pages_read=page_count, page_count=page_count)
@@ -0,0 +1,94 @@
+"""Low-overhead timing of the named stages of an extraction"""
+import json
+import logging
+from time import perf_counter
+
+logger = logging.getLogger("helioscope.timing")
+
+
+class _Span:
+    # Context manager adding the time spent inside it to its stage
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """Total time and call count of each named stage, in the order stages first ran.
+
+        timer = StageTimer()
+        with timer.stage("open"):
+            doc = open_pdf(source)
+
+    A stage entered several times (e.g. once per page) is summed. Stages may
+    nest; by convention a nested stage is named after its parent ("scan.losses").
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.started = perf_counter()
+
+    def stage(self, name):
+        # Registered on entry, so a parent stage is listed before the stages nested in it
+        if name not in self.stages:
+            self.stages[name] = [0.0, 0]
+        return _Span(self, name)
+
+    def add(self, name, seconds):
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    @property
+    def elapsed(self):
+        """Seconds since the timer was created"""
+        return perf_counter() - self.started
+
+    def records(self):
+        """One dict per stage: name, calls and total milliseconds"""
+        return [
+            {"stage": name, "calls": calls, "ms": round(seconds * 1000, 3)}
+            for name, (seconds, calls) in self.stages.items()
+        ]
+
+    def summary(self, **context):
+        """context plus the total and per-stage timings, as a JSON-ready dict"""
+        return dict(context, total_ms=round(self.elapsed * 1000, 3), stages=self.records())
+
+    def log(self, message, **context):
+        """Log the summary as one structured record and return it"""
+        record = self.summary(**context)
+        # The payload is in the message for plain handlers and in extra for structured ones
+        logger.info("%s %s", message, json.dumps(record), extra={"stage_timings": record})
+        return record
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _NullTimer:
+    # Stand-in when nobody asked for timings; stage() costs one method call
+    _span = _NullSpan()
+
+    def stage(self, name):
+        return self._span
+
+
+NULL_TIMER = _NullTimer()
@@ -0,0 +1,243 @@
+"""Synthetic Helioscope-style reports with known contents, for benchmarking the extractor.
+
+    python synthetic_reports.py corpus/ --pages 5 50 200 --components 3 8 --losses 5 14
+
+Writes report_NNN.pdf with its ground truth (a HelioscopeExtraction as JSON)
+in report_NNN.json; `python bench_extraction.py corpus corpus/` measures the
+extractor against them.
+"""
+import argparse
+import itertools
+import os
+import random
+from dataclasses import dataclass, replace
+from io import BytesIO
+
+import fitz  # PyMuPDF
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from helioscope_extractor import ComponentRow, HelioscopeExtraction, LossRow, WiringZoneRow
+
+# Component rows beyond Inverters, Strings and Module: name, description and unit
+EXTRA_COMPONENTS = (
+    ("AC Home Runs", "3/0 AWG (Aluminum)", "ft"),
+    ("Combiner Home Runs", "1/0 AWG (Copper)", "ft"),
+    ("AC Panels", "Square D 400A Panelboard", "kW"),
+    ("Optimizers", "Tigo TS4-A-O (700W)", "kW"),
+)
+
+LOSS_NAMES = (
+    "Shading", "Reflection", "Soiling", "Irradiance", "Temperature", "Mismatch",
+    "Wiring", "Clipping", "Inverter", "Transformer", "AC System", "Module Degradation",
+    "Availability", "Snow",
+)
+
+INVERTERS = (
+    ("CPS SCA50KTL-DO/US-480 (CPS)", 50.0),
+    ("Sungrow SG125CX-P2 (Sungrow)", 125.0),
+    ("SMA Sunny Tripower CORE1 62-US (SMA)", 62.0),
+)
+
+MODULES = (
+    ("Sunsprint Engineering, SPISLE575-144TGG (575W)", 575),
+    ("Canadian Solar, CS6W-550MB-AG (550W)", 550),
+    ("Jinko Solar, JKM545M-72HL4-V (545W)", 545),
+)
+
+STREETS = ("Main Street", "Industrial Parkway", "County Road 12", "Commerce Drive", "Airport Boulevard")
+CITIES = ("Springfield, IL 62701", "Madison, WI 53703", "Fresno, CA 93721", "Albany, NY 12207")
+
+# Fields compared by field_accuracy
+ACCURACY_FIELDS = (
+    "project_name", "project_address", "annual_production", "performance_ratio",
+    "weather_dataset", "components", "system_losses", "wiring_zones",
+)
+
+_STYLES = getSampleStyleSheet()
+
+_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.grey),
+])
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """Shape of one synthetic report"""
+    pages: int = 5
+    components: int = 3
+    losses: int = 5
+    wiring_zones: int = 1
+    seed: int = 0
+
+
+# Reports added to every corpus whose tables run across a page break: the
+# losses fill most of the first table page, so the Components table goes on
+# at the top of the next page, above the Wiring Zones
+PAGE_BREAK_SPECS = (
+    ReportSpec(pages=10, components=8, losses=25, wiring_zones=4),
+)
+
+
+def _truth(spec):
+    # The HelioscopeExtraction the report is built from
+    rng = random.Random(spec.seed)
+    inverter, inverter_kw = rng.choice(INVERTERS)
+    module, module_w = rng.choice(MODULES)
+    inverter_count = rng.randint(1, 40)
+    module_count = rng.randint(100, 20000)
+    string_count = rng.randint(inverter_count, inverter_count * 20)
+
+    components = [
+        ComponentRow("Inverters", inverter, inverter_count, round(inverter_count * inverter_kw, 1), "kW"),
+        ComponentRow("Strings", "10 AWG (Copper)", string_count, round(rng.uniform(100, 90000), 1), "ft"),
+        ComponentRow("Module", module, module_count, round(module_count * module_w / 1000, 1), "kW"),
+    ]
+    for name, description, unit in itertools.islice(itertools.cycle(EXTRA_COMPONENTS), max(spec.components - 3, 0)):
+        components.append(
+            ComponentRow(name, description, rng.randint(1, 50), round(rng.uniform(10, 5000), 1), unit)
+        )
+
+    # Beyond the named losses, repeat them with a letter suffix ("Soiling B")
+    loss_names = [
+        name if round_ == 0 else f"{name} {chr(ord('A') + round_)}"
+        for round_ in range(spec.losses // len(LOSS_NAMES) + 1)
+        for name in LOSS_NAMES
+    ][:spec.losses]
+    losses = [LossRow(name, round(rng.uniform(0.1, 9.9), 1)) for name in loss_names]
+
+    wiring_zones = [
+        WiringZoneRow(f"Wiring Zone {chr(ord('A') + index)}", str(rng.choice((8, 12, 16, 24))),
+                      f"{rng.randint(6, 10)}-{rng.randint(11, 16)}", "Along Racking")
+        for index in range(spec.wiring_zones)
+    ]
+
+    return HelioscopeExtraction(
+        project_name=f"Synthetic Solar {spec.seed}",
+        project_address=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+        annual_production=round(rng.uniform(50, 5000), 1),
+        performance_ratio=round(rng.uniform(70, 90), 1),
+        weather_dataset=f"TMY, 10km grid ({rng.uniform(25, 48):.2f},{rng.uniform(-122, -70):.2f}), NREL (prospector)",
+        components=tuple(components),
+        system_losses=tuple(losses),
+        wiring_zones=tuple(wiring_zones),
+    )
+
+
+def _table(rows):
+    table = Table(rows, hAlign="LEFT")
+    table.setStyle(_TABLE_STYLE)
+    return table
+
+
+def _appendix_page(rng, number):
+    # A shading appendix page: heading and a table of percentages the extractor must ignore
+    rows = [["Field Segment", "Azimuth", "Tilt", "Solar Access", "Avg TSRF", "Shaded Hours"]]
+    rows.extend(
+        [f"Field Segment {number}.{row}", f"{rng.randint(90, 270)}", f"{rng.randint(5, 30)}",
+         f"{rng.uniform(80, 100):.1f}%", f"{rng.uniform(70, 100):.1f}%", f"{rng.randint(0, 900)}"]
+        for row in range(1, 31)
+    )
+    return [Paragraph(f"Shading Appendix {number}", _STYLES['Heading2']), _table(rows)]
+
+
+def generate_report(spec):
+    """PDF bytes of a synthetic report and the HelioscopeExtraction it should yield"""
+    truth = _truth(spec)
+    rng = random.Random(spec.seed + 1)
+    street, city = truth.project_address.split(", ", 1)
+
+    elements = [
+        Paragraph("HelioScope Design Report", _STYLES['Title']),
+        _table([
+            ["Project Name", truth.project_name],
+            ["Project Address", f"{street}\n{city} USA"],
+            ["Prepared By", "Design Team"],
+        ]),
+        Spacer(1, 12),
+        _table([
+            ["Annual Production", f"{truth.annual_production} MWh"],
+            ["Performance Ratio", f"{truth.performance_ratio}%"],
+            ["kWh/kWp", f"{rng.uniform(900, 1900):,.1f}"],
+            ["Weather Dataset", truth.weather_dataset],
+            ["Simulator Version", f"{rng.getrandbits(40):010x}"],
+        ]),
+        PageBreak(),
+        Paragraph("System Losses", _STYLES['Heading2']),
+        _table([[loss.loss_type, f"{loss.loss_percent}%"] for loss in truth.system_losses]),
+        Paragraph("Components", _STYLES['Heading2']),
+        _table([["Component", "Name", "Count"]] + [
+            [row.component, row.description, f"{row.count} ({row.value:,} {row.unit})"] for row in truth.components
+        ]),
+        Paragraph("Wiring Zones", _STYLES['Heading2']),
+        _table([["Description", "Combiner Poles", "String Size", "Stringing Strategy"]] + [
+            [zone.description, zone.combiner_poles, zone.string_size, zone.stringing_strategy]
+            for zone in truth.wiring_zones
+        ]),
+    ]
+    for number in range(1, spec.pages - 1):
+        elements.append(PageBreak())
+        elements.extend(_appendix_page(rng, number))
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(elements)
+    pdf_content = buffer.getvalue()
+    with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+        page_count = doc.page_count
+    return pdf_content, replace(truth, page_count=page_count)
+
+
+def field_accuracy(extraction, truth):
+    """Map each of ACCURACY_FIELDS to whether the extraction got it exactly right"""
+    return {name: getattr(extraction, name) == getattr(truth, name) for name in ACCURACY_FIELDS}
+
+
+def generate_corpus(directory, specs):
+    """Write report_NNN.pdf and its ground truth report_NNN.json for each spec, returning the PDF paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, spec in enumerate(specs):
+        pdf_content, truth = generate_report(spec)
+        path = os.path.join(directory, f"report_{index:03d}.pdf")
+        with open(path, "wb") as file:
+            file.write(pdf_content)
+        with open(path[:-len(".pdf")] + ".json", "w") as file:
+            file.write(truth.to_json())
+        paths.append(path)
+    return paths
+
+
+def corpus_specs(pages_list, components_list, losses_list, seed=0):
+    """One spec per combination of page count, component count and losses rows, then PAGE_BREAK_SPECS"""
+    specs = [
+        ReportSpec(pages=pages, components=components, losses=losses)
+        for pages, components, losses in itertools.product(pages_list, components_list, losses_list)
+    ]
+    specs.extend(PAGE_BREAK_SPECS)
+    return [replace(spec, seed=seed + index) for index, spec in enumerate(specs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a corpus of synthetic Helioscope reports")
+    parser.add_argument("directory")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 50, 200])
+    parser.add_argument("--components", type=int, nargs="+", default=[3, 8])
+    parser.add_argument("--losses", type=int, nargs="+", default=[5, 14])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    specs = corpus_specs(args.pages, args.components, args.losses, args.seed)
+    for path, spec in zip(generate_corpus(args.directory, specs), specs):
+        print(
+            f"{path}: {spec.pages} pages, {spec.components} components, {spec.losses} losses, "
+            f"{spec.wiring_zones} wiring zones"
+        )
+
+
+if __name__ == "__main__":
+    main()
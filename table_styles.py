@@ -0,0 +1,108 @@
+"""Table styles shared by every reportlab schedule renderer, built once per process"""
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle
+
+HEADER_GREEN = colors.HexColor('#2E7D32')  # Dark green
+ROW_GREEN = colors.HexColor('#E8F5E9')  # Light green
+
+# Title font size and padding for letter pages and for double-width pages
+LETTER_TITLE = (14, 15)
+WIDE_TITLE = (16, 20)
+
+# Section: what it changes of the base style (arguments of base_table_commands),
+# and any extra commands applied over it
+SECTION_TABLE_STYLES = {
+    "System Summary": {},
+    "Feed Schedule": {},
+    "Metco Equipment": {},
+    "Inverter Schedule": {
+        "header_rows": 2,
+        "header_font": (10, 12),
+        "header_padding": (8, 8),
+        "body_font": (9, 10),
+    },
+    "String Table": {
+        "header_rows": 2,
+        "header_font": (10, 12),
+        "header_padding": (8, 8),
+        "body_font": (9, 10),
+        "extra": (
+            ('SPAN', (0, 0), (0, 1)),  # TAG
+            ('SPAN', (1, 0), (1, 1)),  # #
+        ),
+    },
+    "Panel Schedule": {},
+}
+
+
+@lru_cache(maxsize=None)
+def base_table_commands(header_rows=1, header_font=(11, 12), header_padding=(3, 8),
+                        body_font=(9, 12), body_padding=(6, 6), body_align='CENTER'):
+    """Green header, grid and alternating row colors of every schedule table.
+
+    Fonts are (size, leading) and paddings (top, bottom). Cell commands are
+    applied cell by cell, so each region gets one FONT command and nothing
+    that repeats reportlab's defaults (black text, no word wrapping of plain
+    strings); GRID already draws every line, and ROWBACKGROUNDS colors the
+    rows with one command however many rows the table has.
+    """
+    header = ((0, 0), (-1, header_rows - 1))
+    body = ((0, header_rows), (-1, -1))
+    return (
+        # Header styling
+        ('BACKGROUND', *header, HEADER_GREEN),
+        ('TEXTCOLOR', *header, colors.white),
+        ('ALIGN', *header, 'CENTER'),
+        ('FONT', *header, 'Helvetica-Bold', *header_font),
+        ('TOPPADDING', *header, header_padding[0]),
+        ('BOTTOMPADDING', *header, header_padding[1]),
+
+        # Content styling
+        ('ALIGN', *body, body_align),
+        ('FONT', *body, 'Helvetica', *body_font),
+        ('TOPPADDING', *body, body_padding[0]),
+        ('BOTTOMPADDING', *body, body_padding[1]),
+
+        # Grid styling
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+
+        # Alternate row colors
+        ('ROWBACKGROUNDS', *body, [ROW_GREEN, colors.white]),
+    )
+
+
+@lru_cache(maxsize=None)
+def section_table_style(section):
+    """The base style with the section's overrides applied, shared by every table of the section"""
+    overrides = dict(SECTION_TABLE_STYLES[section])
+    extra = overrides.pop("extra", ())
+    return TableStyle(base_table_commands(**overrides) + extra)
+
+
+@lru_cache(maxsize=None)
+def title_style(font_size, padding):
+    """Centered dark green title text"""
+    return TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        ('TOPPADDING', (0, 0), (-1, -1), padding),
+        ('TEXTCOLOR', (0, 0), (-1, -1), HEADER_GREEN),
+    ])
+
+
+def title_table(text, width, size=LETTER_TITLE):
+    """One-cell table holding a section title, as wide as the table below it"""
+    title = Table([[text]], colWidths=[width])
+    title.setStyle(title_style(*size))
+    return title
+
+
+def styled_table(section, table_data, col_widths, **kwargs):
+    """Table of a schedule section styled with the section's shared style"""
+    table = Table(table_data, colWidths=col_widths, **kwargs)
+    table.setStyle(section_table_style(section))
+    return table
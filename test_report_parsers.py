@@ -0,0 +1,93 @@
+"""Parse checks of the registered report parsers on text laid out like each tool's report pages.
+
+    python -m pytest test_report_parsers.py
+"""
+from helioscope_extractor import ComponentRow, LossRow
+from report_parsers import detect_parser, parse_aurora_text, parse_pvsyst_text
+
+# PVsyst V7 project summary and PV array characteristics pages
+PVSYST_TEXT = """Project: Riverside Solar Farm
+Variant: Final design
+PVsyst V7.4.2
+Project summary
+Geographical Site  Fresno, United States
+Meteo data  Fresno  Meteonorm 8.1 (2010-2019), Sat=100%
+System summary
+Nb. of modules 1,800 units
+Pnom total 990 kWp
+Nb. of units 8 units
+Pnom total 800 kWac
+Results summary
+Produced Energy 1,712.4 MWh/year  Specific production 1730 kWh/kWp/year
+Perf. Ratio PR 83.21 %
+PVsyst V7.4.2
+PV Array Characteristics
+PV module
+Manufacturer  Jinkosolar
+Model  JKM550M-72HL4-V
+Inverter
+Manufacturer  SMA
+Model  Sunny Highpower PEAK3 100-US
+Modules 90 Strings x 20 In series
+Array losses
+Array Soiling Losses
+Loss Fraction 2.0 %
+Module mismatch losses
+Loss Fraction 1.5. % at MPP
+DC wiring losses Global array res. 12 mOhm
+Loss Fraction 1.2 % at STC"""
+
+# Aurora Solar performance simulation summary page
+AURORA_TEXT = """Aurora Solar  Performance Simulation
+Prepared by: Jane Doe
+Email Address: jane@example.com
+Project Name: Smith Residence
+Project Address: 12 Oak Lane, Madison, WI 53703
+System Size 12.2 kW DC
+AC System Size 7.6 kW
+Annual Energy Production 15,230 kWh
+Performance Ratio 79.5 %
+Weather Dataset TMY3 Madison Dane Co Rgnl
+Components
+Inverters  SolarEdge SE7600H-US  1
+Modules  REC Alpha 405 (405W)  30 (12.2. kW)
+Strings  10 AWG (Copper)  2 (180 ft)
+System Losses
+Soiling  2 %
+Shading  3.4. %
+Mismatch  2 %"""
+
+
+def test_detect_parser_by_header():
+    assert detect_parser(PVSYST_TEXT).name == "pvsyst"
+    assert detect_parser(AURORA_TEXT).name == "aurora"
+    assert detect_parser("Imported from Aurora Solar\nHelioScope Design Report").name == "helioscope"
+
+
+def test_parse_pvsyst_text():
+    extraction = parse_pvsyst_text(PVSYST_TEXT)
+    assert extraction.project_name == "Riverside Solar Farm"
+    assert extraction.project_address == "Fresno, United States"
+    assert extraction.annual_production == 1712.4
+    assert extraction.performance_ratio == 83.21
+    assert extraction.components == (
+        ComponentRow("Inverters", "SMA, Sunny Highpower PEAK3 100-US", 8, 800.0, "kW"),
+        ComponentRow("Strings", "20 modules in series", 90, 20.0, "modules"),
+        ComponentRow("Module", "Jinkosolar, JKM550M-72HL4-V", 1800, 990.0, "kW"),
+    )
+    # The mismatch row's "1.5." does not parse, so it is left out
+    assert extraction.system_losses == (LossRow("Array Soiling Losses", 2.0), LossRow("DC wiring losses", 1.2))
+
+
+def test_parse_aurora_text():
+    extraction = parse_aurora_text(AURORA_TEXT)
+    assert extraction.project_name == "Smith Residence"
+    # Not the contact's "Email Address"
+    assert extraction.project_address == "12 Oak Lane, Madison, WI 53703"
+    assert extraction.annual_production == 15.23
+    # The module row's "12.2." does not parse, so there is no module row
+    assert extraction.components == (
+        ComponentRow("Inverters", "SolarEdge SE7600H-US", 1, 7.6, "kW"),
+        ComponentRow("Strings", "10 AWG (Copper)", 2, 180.0, "ft"),
+    )
+    assert extraction.system_losses == (LossRow("Soiling", 2.0), LossRow("Mismatch", 2.0))
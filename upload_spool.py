@@ -0,0 +1,64 @@
+"""Spooling of large PDF uploads to disk, so PyMuPDF can page them from a file"""
+import hashlib
+import os
+import tempfile
+import time
+
+from artifact_store import DEFAULT_MAX_AGE_SECONDS
+
+# Uploads larger than this are copied to a temporary file and opened by path
+SPOOL_THRESHOLD_BYTES = int(os.environ.get("UPLOAD_SPOOL_THRESHOLD_BYTES", 16 * 1024 * 1024))
+
+# Where spooled uploads are written
+SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "helioscope_uploads"))
+
+# Spooled files older than this are removed, like the artifact store's files of ended sessions
+SPOOL_MAX_AGE_SECONDS = DEFAULT_MAX_AGE_SECONDS
+
+# Copy and hash size
+CHUNK_SIZE = 1024 * 1024
+
+
+def read_upload(upload, threshold=SPOOL_THRESHOLD_BYTES, directory=SPOOL_DIR):
+    """Read a file-like upload as (bytes or temporary file path, SHA-256 hex digest).
+
+    Uploads up to threshold bytes come back as bytes. Larger ones are copied to
+    a temporary file in chunks, hashing as they go, so the whole report is never
+    held as one more bytes object; the caller owns the file (see remove_spooled).
+    """
+    upload.seek(0)
+    digest = hashlib.sha256()
+    size = getattr(upload, "size", None)
+    if size is not None and size <= threshold:
+        content = upload.read()
+        digest.update(content)
+        return content, digest.hexdigest()
+
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".pdf", delete=False) as file:
+        for chunk in iter(lambda: upload.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            file.write(chunk)
+    return file.name, digest.hexdigest()
+
+
+def remove_spooled(path):
+    """Delete a spooled upload, ignoring one that is already gone"""
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def sweep_spooled(directory=SPOOL_DIR, max_age=SPOOL_MAX_AGE_SECONDS):
+    """Delete spooled uploads older than max_age seconds"""
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass